@@ -1,30 +1,67 @@
 """
 Telegram bot async background services.
 
-Provides periodic file scanning, progress polling, and idle timeout monitoring.
+Provides state-directory watching, progress watching, and idle timeout monitoring.
 """
 
 import asyncio
-import json
+import contextlib
+import logging
 import sys
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import orjson
+from watchfiles import Change, awatch
 
 if TYPE_CHECKING:
     from telegram.ext import Application
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from format_utils import format_git_status_compact, format_repo_display, convert_to_telegram_markdown
-from file_processors import scan_and_process
+from file_processors import list_pending_files, process_files, scan_json_files
 from handler_classes import (
+    NOTIFY_RATE_LIMIT_SCRIPT,
     NotificationHandler,
     CompletionHandler,
     WorkflowExecutionHandler,
     SummaryHandler
 )
 from deduplication_store import DeduplicationStore
+from message_builders import DEBUG_LOG_LINE
+from state_store import prune_state
+from workspace_helpers import STATE_TTL_MINUTES
 import bot_state
 
+logger = logging.getLogger("lychee.bot")
+
+# Safety sweep interval for the file watcher (catches events missed during restarts)
+SWEEP_INTERVAL_SECONDS = 60
+
+# Minimum seconds between edits of the same progress message; intermediate
+# stages inside the window are coalesced into the next edit ("completed" is never held back)
+PROGRESS_EDIT_MIN_INTERVAL = 3.0
+
+# Changed progress files handled per poller tick (newest first; the rest wait for the next tick)
+MAX_PROGRESS_PER_TICK = 32
+
+# Idle progress is logged at this interval while the bot sits idle
+IDLE_LOG_INTERVAL_SECONDS = 300
+
+# Progress stage -> emoji ("completed" depends on status, resolved in progress_poller)
+_STAGE_EMOJI = {
+    "starting": "🎬",
+    "rendering": "📝",
+    "executing": "⚙️",
+    "waiting": "⏳",
+}
+
+
+def _is_new_json(change: Change, path: str) -> bool:
+    """watchfiles filter: created/modified state files only (skip deletions and .tmp)."""
+    return change != Change.deleted and path.endswith(".json")
+
 
 async def periodic_file_scanner(
     app: "Application",
@@ -34,28 +71,117 @@ async def periodic_file_scanner(
     executions_dir: Path,
     chat_id: int
 ) -> None:
-    """Periodically scan for new notification, completion, summary, and execution files (dual-mode)."""
-    print(f"📂 Periodic file scanner started (every 5s)")
+    """
+    Watch notification, completion, summary, and execution dirs and dispatch new files (dual-mode).
+
+    Event-driven via watchfiles (inotify/FSEvents); a full sweep runs at
+    startup and every SWEEP_INTERVAL_SECONDS to catch anything the watcher missed.
+    """
+    logger.info("📂 File watcher started (sweep every %ss)", SWEEP_INTERVAL_SECONDS)
 
     notification_handler = NotificationHandler(app.bot, chat_id)
     completion_handler = CompletionHandler(app.bot, chat_id)
     summary_handler = SummaryHandler(app.bot, chat_id)  # Phase 3 - v4.0.0
     execution_handler = WorkflowExecutionHandler(app.bot, chat_id)  # Phase 4 - WorkflowExecution completion
 
-    while not bot_state.shutdown_requested:
-        await asyncio.sleep(5)  # Scan every 5 seconds
-
-        # Phase 3 - v4.0.0: Scan for new summaries (prioritize over notifications)
-        await scan_and_process(summaries_dir, "summary_*.json", summary_handler, "send_workflow_menu", "summary")
-
-        # v3 backward compat: Scan for new notifications
-        await scan_and_process(notification_dir, "notify_*.json", notification_handler, "send_notification", "notification")
+    # (directory, prefix, handler, method, file_type) in dispatch priority order
+    scan_targets = (
+        # Phase 3 - v4.0.0: Summaries first (prioritize over notifications)
+        (summaries_dir, "summary_", summary_handler, "send_workflow_menu", "summary"),
+        # v3 backward compat: Notifications
+        (notification_dir, "notify_", notification_handler, "send_notification", "notification"),
+        # v3 backward compat: Completions
+        (completion_dir, "completion_", completion_handler, "send_completion", "completion"),
+        # Phase 4 - v4.0.0: Workflow execution completions
+        (executions_dir, "execution_", execution_handler, "send_execution_completion", "execution"),
+    )
+
+    # Directories found empty at a given mtime; sweeps stat them instead of re-listing
+    empty_listings: Dict[Tuple[Path, str], int] = {}
+
+    async def sweep() -> None:
+        # List all directories concurrently off the event loop, then dispatch
+        listings = await asyncio.gather(*(
+            asyncio.to_thread(list_pending_files, directory, prefix, empty_listings)
+            for directory, prefix, *_ in scan_targets
+        ))
+        # File types are independent: one slow directory no longer holds up the rest.
+        # Tasks start in priority order, so higher-priority files claim the shared
+        # MAX_CONCURRENT_FILES slots first. Only start order is kept: files run
+        # concurrently, so their messages may reach Telegram out of order
+        async with asyncio.TaskGroup() as tg:
+            for files, (_, _, handler, method, file_type) in zip(listings, scan_targets):
+                if files:
+                    tg.create_task(process_files(files, handler, method, file_type))
+
+    # Directories must exist to be watched
+    for directory, *_ in scan_targets:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    await sweep()  # Files written while the bot was down
+    last_sweep = time.monotonic()
+
+    async for changes in awatch(
+        *(directory for directory, *_ in scan_targets),
+        watch_filter=_is_new_json,
+        rust_timeout=SWEEP_INTERVAL_SECONDS * 1000,
+        yield_on_timeout=True
+    ):
+        if bot_state.shutdown_requested:
+            break
 
-        # Scan for new completions (v3 backward compat)
-        await scan_and_process(completion_dir, "completion_*.json", completion_handler, "send_completion", "completion")
+        # Idle timeout (empty set) or overdue: full sweep instead of event dispatch
+        if not changes or time.monotonic() - last_sweep >= SWEEP_INTERVAL_SECONDS:
+            await sweep()
+            last_sweep = time.monotonic()
+            continue
 
-        # Phase 4 - v4.0.0: Scan for workflow execution completions
-        await scan_and_process(executions_dir, "execution_*.json", execution_handler, "send_execution_completion", "execution")
+        # Route changed files by filename prefix, in priority order (concurrently
+        # per type, as in sweep); handlers consume files, so skip any already processed
+        changed = sorted({Path(path) for _, path in changes})
+        async with asyncio.TaskGroup() as tg:
+            for _, prefix, handler, method, file_type in scan_targets:
+                files = [f for f in changed if f.name.startswith(prefix) and f.exists()]
+                if files:
+                    tg.create_task(process_files(files, handler, method, file_type))
+
+
+def _prune_stale_tracking() -> None:
+    """Drop progress tracking for workflows that never reported completion (memory + state store)."""
+    for workspace_id, session_id, workflow_id in bot_state.prune_stale_progress(STATE_TTL_MINUTES * 60):
+        logger.info("🗑️  Tracking: Expired %s/%s (no completion within %sm)", workspace_id, workflow_id, STATE_TTL_MINUTES)
+    prune_state(STATE_TTL_MINUTES)
+
+
+def _progress_header(tracking_context: "bot_state.TrackingEntry", session_id: str) -> str:
+    """
+    Invariant part of a progress message (repository/git/session lines).
+
+    Built once per tracking context and kept on the in-memory entry
+    (not persisted; rebuilt lazily for contexts restored from disk).
+    """
+    header = tracking_context.progress_header
+    if header is None:
+        # Replace home directory with ~ for cleaner display
+        repo_display = format_repo_display(tracking_context.repository_root)
+        # Compact git status (always show all counters)
+        git_status_line = format_git_status_compact(
+            tracking_context.git_modified,
+            tracking_context.git_staged,
+            tracking_context.git_untracked
+        )
+        # Session + debug log lines (two lines, no emoji)
+        # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
+        header = (
+            f"**Repository**: `{repo_display}`\n"
+            f"**Directory**: `{tracking_context.working_directory}`\n"
+            f"**Branch**: `{tracking_context.git_branch}`\n"
+            f"**↯**: {git_status_line}\n\n"
+            f"`session={session_id}`\n"
+            f"{DEBUG_LOG_LINE}\n"
+        )
+        tracking_context.progress_header = header
+    return header
 
 
 async def progress_poller(
@@ -65,49 +191,133 @@ async def progress_poller(
     dedup_store: DeduplicationStore,
     poll_interval: float = 2.0
 ) -> None:
-    """Poll progress files and update Telegram messages with streaming progress."""
-    print(f"📊 Progress poller started (every {poll_interval}s)")
-    print(f"   Progress directory: {progress_dir}")
-    print(f"   Active tracking: {len(bot_state.active_progress_updates)} workflows")
+    """
+    Watch progress files and update Telegram messages with streaming progress.
+
+    Sleeps until watchfiles reports a progress write (no idle directory
+    scans); poll_interval is kept as the minimum spacing between ticks so
+    bursts of writes coalesce.
+    """
+    logger.info("📊 Progress watcher started (min interval %ss)", poll_interval)
+    logger.info("Progress directory: %s", progress_dir)
+    logger.info("Active tracking: %s workflows", len(bot_state.active_progress_updates))
+
+    # Directory must exist to be watched
+    progress_dir.mkdir(parents=True, exist_ok=True)
+
+    progress_changed = asyncio.Event()
+    progress_changed.set()  # Initial scan (files written while the bot was down)
+    # Newly registered tracking wakes the poller too (its files may already be on disk)
+    bot_state.progress_wakeup = progress_changed
+    watch_task = asyncio.create_task(_watch_progress_dir(progress_dir, progress_changed))
+    try:
+        await _process_progress_updates(app, progress_dir, chat_id, dedup_store, poll_interval, progress_changed)
+    finally:
+        bot_state.progress_wakeup = None
+        watch_task.cancel()
+
+
+async def _watch_progress_dir(progress_dir: Path, progress_changed: asyncio.Event) -> None:
+    """Set progress_changed whenever a progress file is written (inotify/FSEvents)."""
+    async for _ in awatch(progress_dir, watch_filter=_is_new_json):
+        progress_changed.set()
+
+
+async def _process_progress_updates(
+    app: "Application",
+    progress_dir: Path,
+    chat_id: int,
+    dedup_store: DeduplicationStore,
+    poll_interval: float,
+    progress_changed: asyncio.Event
+) -> None:
+    """Progress tick loop: apply changed progress files to their tracked Telegram messages."""
+    # (st_mtime_ns, st_size) of progress files already applied; unchanged files are skipped
+    progress_file_state: Dict[Path, Tuple[int, int]] = {}
+    # message_id -> monotonic time of last edit (per-message debounce)
+    last_edit_at: Dict[int, float] = {}
+    last_prune = time.monotonic()
+    # Files left unapplied last tick (debounced or over the per-tick cap) need a revisit
+    pending = False
+    # Directory mtime at the last scan (progress files are replaced via rename, which bumps it)
+    last_scan_mtime_ns: Optional[int] = None
 
     while not bot_state.shutdown_requested:
+        # Coalesce writes for poll_interval; then, with nothing pending, wait for
+        # the next write (timeout keeps the TTL prune and a safety rescan going)
         await asyncio.sleep(poll_interval)
-
-        if not progress_dir.exists():
+        revisit = pending
+        if not pending:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(progress_changed.wait(), SWEEP_INTERVAL_SECONDS)
+        woken = progress_changed.is_set()
+        progress_changed.clear()
+        pending = False
+
+        # Bound tracking state for workflows abandoned without an execution result
+        if time.monotonic() - last_prune >= SWEEP_INTERVAL_SECONDS:
+            _prune_stale_tracking()
+            last_prune = time.monotonic()
+
+        # Safety-rescan wake with no watcher/tracking event, no directory change and no
+        # file left unapplied (pending: debounced, over the cap, or not yet tracked):
+        # one stat, no listing
+        try:
+            dir_mtime_ns: Optional[int] = progress_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime_ns = None
+        if not woken and not revisit and dir_mtime_ns == last_scan_mtime_ns:
             continue
+        last_scan_mtime_ns = dir_mtime_ns
 
-        # Get all JSON files in progress directory
-        all_json_files = list(progress_dir.glob("*.json"))
+        # Get all JSON files in progress directory (empty if directory missing)
+        all_json_files = scan_json_files(progress_dir)
 
         # Filter out schema.json
         progress_files = [f for f in all_json_files if f.name != "schema.json"]
 
-        # Extensive logging for debugging
-        if all_json_files:
-            print(f"\n📂 Progress directory scan:")
-            print(f"   Total JSON files: {len(all_json_files)}")
-            print(f"   Files found: {[f.name for f in all_json_files]}")
-            print(f"   After filtering schema.json: {len(progress_files)} files")
-            if progress_files:
-                print(f"   Processing: {[f.name for f in progress_files]}")
+        # Forget files that no longer exist
+        for gone in progress_file_state.keys() - set(progress_files):
+            del progress_file_state[gone]
+
+        # Per-tick scan details (BOT_LOG_LEVEL=DEBUG); name lists only built when enabled
+        if all_json_files and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📂 Progress directory scan: %d JSON file(s) %s, %d after filtering schema.json",
+                len(all_json_files), [f.name for f in all_json_files], len(progress_files)
+            )
 
+        # Skip files unchanged since they were last applied (one stat, no read/parse)
+        changed: List[Tuple[int, Path, Tuple[int, int]]] = []
         for progress_file in progress_files:
             try:
-                print(f"\n📊 Processing progress file: {progress_file.name}")
-
-                # Read progress data
-                with open(progress_file, "r") as f:
-                    content = f.read()
-                    print(f"   File size: {len(content)} bytes")
-                    progress = json.load(open(progress_file, "r"))
-
-                print(f"   JSON parsed successfully")
-                print(f"   Keys in progress: {list(progress.keys())}")
+                st = progress_file.stat()
+            except FileNotFoundError:
+                continue
+            signature = (st.st_mtime_ns, st.st_size)
+            if progress_file_state.get(progress_file) != signature:
+                changed.append((st.st_mtime_ns, progress_file, signature))
+
+        # Newest first so a burst can't starve fresh updates; bounded work per tick
+        changed.sort(reverse=True)
+        if len(changed) > MAX_PROGRESS_PER_TICK:
+            pending = True
+            logger.debug("Deferring %d progress file(s) to next tick", len(changed) - MAX_PROGRESS_PER_TICK)
+
+        for _, progress_file, signature in changed[:MAX_PROGRESS_PER_TICK]:
+            try:
+                # Read progress data (single read; parse the same bytes)
+                content = progress_file.read_bytes()
+                progress = orjson.loads(content)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "📊 Processing progress file: %s (%d bytes, keys: %s)",
+                        progress_file.name, len(content), list(progress.keys())
+                    )
 
-                # Extract required fields with detailed logging
+                # Extract required fields
                 if "workspace_id" not in progress:
-                    print(f"   ⚠️  Missing workspace_id field!")
-                    print(f"   Progress content: {progress}")
+                    logger.warning("⚠️  Missing workspace_id field in %s: %s", progress_file.name, progress)
                     continue
 
                 workspace_id = progress["workspace_id"]
@@ -118,62 +328,51 @@ async def progress_poller(
                 progress_percent = progress["progress_percent"]
                 message = progress["message"]
 
-                print(f"   ✅ Extracted fields:")
-                print(f"      workspace_id: {workspace_id}")
-                print(f"      session_id: {session_id}")
-                print(f"      workflow_id: {workflow_id}")
-                print(f"      status: {status}")
-                print(f"      stage: {stage} ({progress_percent}%)")
+                logger.debug(
+                    "   workspace_id=%s session_id=%s workflow_id=%s status=%s stage=%s (%s%%)",
+                    workspace_id, session_id, workflow_id, status, stage, progress_percent
+                )
 
                 # Check if we're tracking this workflow
                 progress_key = (workspace_id, session_id, workflow_id)
                 if progress_key not in bot_state.active_progress_updates:
-                    print(f"   ⏭️  Not tracking this workflow (no message_id registered)")
+                    logger.debug("   ⏭️  Not tracking this workflow (no message_id registered)")
+                    # Tracking is usually registered moments after the orchestrator's first
+                    # writes: keep revisiting (signature unrecorded) until applied, or until
+                    # the file is older than the tracking TTL (workflow abandoned)
+                    if time.time() - signature[0] / 1e9 < STATE_TTL_MINUTES * 60:
+                        pending = True
                     continue
 
                 # Extract tracking context (message_id + repository/git info)
                 tracking_context = bot_state.active_progress_updates[progress_key]
-                message_id = tracking_context["message_id"]
-                git_branch = tracking_context.get("git_branch", "unknown")
-                repository_root = tracking_context.get("repository_root", "unknown")
-                working_dir = tracking_context.get("working_directory", ".")
-                workflow_name = tracking_context.get("workflow_name", workflow_id)
-                git_modified = tracking_context.get("git_modified", 0)
-                git_untracked = tracking_context.get("git_untracked", 0)
-                git_staged = tracking_context.get("git_staged", 0)
+                message_id = tracking_context.message_id
+                git_branch = tracking_context.git_branch
+                workflow_name = tracking_context.workflow_name
+
+                # Same state as the last edit (file rewritten, nothing new): skip before rendering
+                progress_state = (status, stage, progress_percent, message)
+                if tracking_context.last_progress == progress_state:
+                    progress_file_state[progress_file] = signature
+                    continue
 
-                # Replace home directory with ~ for cleaner display
-                repo_display = format_repo_display(repository_root)
+                # Debounce: leave the file unapplied so the next tick sends its latest state
+                if stage != "completed" and time.monotonic() - last_edit_at.get(message_id, float("-inf")) < PROGRESS_EDIT_MIN_INTERVAL:
+                    logger.debug("   ⏳ Debounced (edited <%ss ago)", PROGRESS_EDIT_MIN_INTERVAL)
+                    pending = True
+                    continue
 
-                print(f"   📝 Updating message_id: {message_id} (branch: {git_branch})")
+                logger.debug("   📝 Updating message_id: %s (branch: %s)", message_id, git_branch)
 
                 # Build progress caption (Phase 2: edit caption instead of text)
-                stage_emoji = {
-                    "starting": "🎬",
-                    "rendering": "📝",
-                    "executing": "⚙️",
-                    "waiting": "⏳",
-                    "completed": "✅" if status == "success" else "❌"
-                }
-                emoji = stage_emoji.get(stage, "📊")
-
-                # Build git status line
-                # Compact git status (always show all counters)
-                git_status_line = format_git_status_compact(git_modified, git_staged, git_untracked)
-
-                # Session + debug log lines (two lines, no emoji)
-                # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-                session_line = f"`session={session_id}`"
-                debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
+                if stage == "completed":
+                    emoji = "✅" if status == "success" else "❌"
+                else:
+                    emoji = _STAGE_EMOJI.get(stage, "📊")
 
                 markdown_progress = (
                     f"{emoji} **Workflow: {workflow_name}**\n\n"
-                    f"**Repository**: `{repo_display}`\n"
-                    f"**Directory**: `{working_dir}`\n"
-                    f"**Branch**: `{git_branch}`\n"
-                    f"**↯**: {git_status_line}\n\n"
-                    f"{session_line}\n"
-                    f"{debug_line}\n"
+                    f"{_progress_header(tracking_context, session_id)}"
                     f"**Stage**: {stage}\n"
                     f"**Progress**: {progress_percent}%\n"
                     f"**Status**: {message}"
@@ -182,6 +381,7 @@ async def progress_poller(
 
                 # Check deduplication BEFORE calling API (prevents redundant calls)
                 if dedup_store.check_duplicate(workspace_id, session_id, workflow_id, progress_text):
+                    progress_file_state[progress_file] = signature
                     continue
 
                 # Update message text
@@ -194,22 +394,24 @@ async def progress_poller(
                     )
                     # Record successful send for deduplication
                     dedup_store.record_sent(workspace_id, session_id, workflow_id, progress_text)
-                    print(f"   ✅ Message updated successfully")
+                    last_edit_at[message_id] = time.monotonic()
+                    tracking_context.last_progress = progress_state
+                    logger.info("📊 Progress updated: %s (%s %s%%)", progress_file.name, stage, progress_percent)
                 except Exception as edit_error:
                     # Handle Telegram API errors gracefully (e.g., duplicate content, rate limits)
                     error_type = type(edit_error).__name__
                     error_str = str(edit_error)
 
                     if "BadRequest" in error_type and "not modified" in error_str.lower():
-                        print(f"   ⏭️  Skipped update (content unchanged)")
+                        logger.debug("⏭️  Skipped update (content unchanged)")
                     elif "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                         # Rate limit hit - send Pushover alert
                         retry_after = getattr(edit_error, 'retry_after', 'unknown')
-                        print(f"   ⚠️  RATE LIMIT HIT: Retry after {retry_after}s", file=sys.stderr)
+                        logger.warning("⚠️  RATE LIMIT HIT: Retry after %ss", retry_after)
 
                         # Send Pushover notification (fire-and-forget)
                         import subprocess
-                        notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                        notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                         if notify_script.exists():
                             subprocess.Popen([
                                 str(notify_script),
@@ -225,49 +427,70 @@ async def progress_poller(
                         # Re-raise unexpected errors
                         raise
 
+                progress_file_state[progress_file] = signature
+
                 # Clean up progress file (but keep tracking for execution completion)
                 if stage == "completed":
-                    print(f"   🗑️  Removing completed progress file: {progress_file.name}")
+                    logger.info("🗑️  Removing completed progress file: %s", progress_file.name)
                     progress_file.unlink()
+                    progress_file_state.pop(progress_file, None)
+                    last_edit_at.pop(message_id, None)
                     # Clean up deduplication state for completed workflow
                     dedup_store.cleanup(workspace_id, session_id, workflow_id)
-                    print(f"   ℹ️  Keeping tracking active for execution completion handler")
+                    logger.info("ℹ️  Keeping tracking active for execution completion handler")
 
             except KeyError as e:
-                print(f"❌ Missing field in {progress_file.name}: {e}", file=sys.stderr)
-                print(f"   File content preview: {content[:500]}", file=sys.stderr)
-            except json.JSONDecodeError as e:
-                print(f"❌ JSON parse error in {progress_file.name}: {e}", file=sys.stderr)
-                print(f"   File content: {content}", file=sys.stderr)
+                logger.error("❌ Missing field in %s: %s", progress_file.name, e)
+                logger.error("File content preview: %s", content[:500].decode(errors='replace'))
+            except orjson.JSONDecodeError as e:
+                logger.error("❌ JSON parse error in %s: %s", progress_file.name, e)
+                logger.error("File content: %s", content.decode(errors='replace'))
             except Exception as e:
-                print(f"❌ Failed to process progress {progress_file.name}: {type(e).__name__}: {e}", file=sys.stderr)
-                import traceback
-                print(f"   Full traceback:", file=sys.stderr)
-                traceback.print_exc(file=sys.stderr)
+                logger.exception("❌ Failed to process progress %s: %s: %s", progress_file.name, type(e).__name__, e)
+
 
+def start_idle_timer(idle_timeout_seconds: int) -> None:
+    """
+    Request shutdown once the bot has been idle for idle_timeout_seconds.
 
-async def idle_timeout_monitor(idle_timeout_seconds: int) -> None:
-    """Monitor idle time and request shutdown if timeout exceeded."""
+    A single TimerHandle armed for the earliest possible expiry. If activity
+    happened meanwhile it re-arms for the remaining idle time, so
+    update_activity() stays a timestamp write and nothing polls. A separate
+    timer logs idle progress every IDLE_LOG_INTERVAL_SECONDS.
+    """
     if idle_timeout_seconds == 0:
-        print(f"⏱️  Idle timeout monitor: DISABLED (running continuously)")
-        # Just wait for shutdown signal, don't enforce timeout
-        while not bot_state.shutdown_requested:
-            await asyncio.sleep(60)  # Check every minute
+        logger.info("⏱️  Idle timeout: DISABLED (running continuously)")
         return
 
-    print(f"⏱️  Idle timeout monitor started ({idle_timeout_seconds}s)")
-
-    while not bot_state.shutdown_requested:
-        await asyncio.sleep(30)  # Check every 30 seconds
+    logger.info("⏱️  Idle timeout timer started (%ss)", idle_timeout_seconds)
+    loop = asyncio.get_running_loop()
 
+    def on_idle_deadline() -> None:
         idle_time = bot_state.get_idle_time()
         if idle_time >= idle_timeout_seconds:
-            print(f"\n⏱️  Idle timeout reached ({idle_time:.0f}s >= {idle_timeout_seconds}s)")
-            print("   Shutting down...")
-            bot_state.shutdown_requested = True
-            break
-
-        # Log progress every 5 minutes
-        if int(idle_time) % 300 == 0 and idle_time > 0:
+            logger.info("⏱️  Idle timeout reached (%.0fs >= %ss)", idle_time, idle_timeout_seconds)
+            logger.info("Shutting down...")
+            stop_idle_timer()
+            bot_state.request_shutdown()
+            return
+        bot_state.idle_timer = loop.call_later(idle_timeout_seconds - idle_time, on_idle_deadline)
+
+    def log_idle_progress() -> None:
+        idle_time = bot_state.get_idle_time()
+        if idle_time >= IDLE_LOG_INTERVAL_SECONDS:
             remaining = idle_timeout_seconds - idle_time
-            print(f"⏱️  Idle: {idle_time:.0f}s, auto-shutdown in {remaining:.0f}s")
+            logger.info("⏱️  Idle: %.0fs, auto-shutdown in %.0fs", idle_time, remaining)
+        bot_state.idle_log_timer = loop.call_later(IDLE_LOG_INTERVAL_SECONDS, log_idle_progress)
+
+    bot_state.idle_timer = loop.call_later(
+        idle_timeout_seconds - bot_state.get_idle_time(), on_idle_deadline
+    )
+    bot_state.idle_log_timer = loop.call_later(IDLE_LOG_INTERVAL_SECONDS, log_idle_progress)
+
+
+def stop_idle_timer() -> None:
+    """Cancel the idle timers (no-op if not started)."""
+    for handle in (bot_state.idle_timer, bot_state.idle_log_timer):
+        if handle is not None:
+            handle.cancel()
+    bot_state.idle_timer = bot_state.idle_log_timer = None
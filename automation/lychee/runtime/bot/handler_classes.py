@@ -4,7 +4,10 @@ Telegram bot handler classes.
 File-based handlers for notifications, completions, executions, and summaries.
 """
 
-import sys
+import asyncio
+import logging
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
@@ -13,22 +16,27 @@ from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 from workspace_helpers import (
     get_workspace_id_from_path,
     compute_workspace_hash,
-    create_callback_data
+    create_callback_data_batch
 )
 from format_utils import (
     get_workspace_config,
     format_repo_display,
     format_git_status_compact,
+    format_git_porcelain_display,
     escape_markdown,  # DEPRECATED: Use escape_html
     escape_html,
     truncate_markdown_safe,
     extract_conversation_from_transcript,
+    first_nonempty_line,
     convert_to_telegram_markdown
 )
-from bot_utils import log_event
+from bot_utils import queue_event
 from message_builders import (
+    DEBUG_LOG_LINE,
+    DEBUG_LOG_LINE_FORMAT,
     build_completion_message,
-    build_execution_message
+    build_execution_message,
+    format_session_lines
 )
 from file_validators import (
     validate_notification_file,
@@ -37,13 +45,52 @@ from file_validators import (
     validate_summary_file
 )
 from keyboard_builders import build_workflow_keyboard
-from workflow_utils import filter_workflows_by_triggers
+from workflow_utils import filter_workflows_by_triggers, refresh_workflow_registry
 import bot_state
+import state_store
 from bot_state import update_activity
 
 
-# Module-level constant (shared with main file)
-TRACKING_DIR = Path.home() / ".claude" / "automation" / "lychee" / "state" / "tracking"
+# Module-level constants (shared with main file)
+NOTIFY_RATE_LIMIT_SCRIPT = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+WORKFLOWS_REGISTRY = Path.home() / ".claude" / "automation" / "lychee" / "state" / "workflows.json"
+
+logger = logging.getLogger("lychee.bot")
+
+# Static layout of the link-validation notification; only the fields vary
+# Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
+NOTIFICATION_TEMPLATE = (
+    "{emoji} **Link Validation** - {ws_name}\n"
+    "\n"
+    "**Workspace**: `{workspace_path}`\n"
+    "`session={session_id}`\n"
+    f"{DEBUG_LOG_LINE_FORMAT}\n"
+    "\n"
+    "{details}{files_section}\n"
+    "\n"
+    "Choose action:\n"
+)
+
+# Notification keyboard layout: rows of (label, action); only callback_data varies per send
+NOTIFICATION_BUTTON_ROWS = (
+    (("✅ Auto-Fix All", "auto_fix_all"), ("❌ Reject", "reject")),
+    (("📋 View Details", "view_details"),),
+)
+NOTIFICATION_BUTTON_ACTIONS = tuple(action for row in NOTIFICATION_BUTTON_ROWS for _, action in row)
+
+
+@lru_cache(maxsize=32)
+def _error_details_pattern(workspace_prefix: str) -> re.Pattern:
+    """
+    Compile the error_details line parser for one workspace.
+
+    Each "path:count" line yields the path (workspace prefix and leading
+    slashes stripped) and the count.
+    """
+    return re.compile(
+        rf"^(?:{re.escape(workspace_prefix)})?/*(?P<file>[^:\n]*):(?P<count>.*)$",
+        re.M
+    )
 
 
 class BaseHandler:
@@ -53,17 +100,30 @@ class BaseHandler:
         self.bot = bot
         self.chat_id = chat_id
 
-    def _cleanup_file(self, file_path: Path, file_type: str = "file") -> None:
+    async def _send_text(self, text: str) -> None:
         """
-        Delete consumed file.
+        Send a MarkdownV2 message without keyboard, coalesced with others when batching is active.
+
+        Raises:
+            Telegram errors from the (possibly joined) send
+        """
+        batcher = bot_state.message_batcher
+        if batcher is None:
+            await self.bot.send_message(chat_id=self.chat_id, text=text, parse_mode="MarkdownV2")
+        else:
+            await batcher.send(self.chat_id, text, parse_mode="MarkdownV2")
+
+    async def _cleanup_file(self, file_path: Path, file_type: str = "file") -> None:
+        """
+        Delete consumed file (in a worker thread; unlink can stall on slow filesystems).
 
         Args:
             file_path: Path to file to delete
             file_type: Human-readable file type for logging
         """
         try:
-            file_path.unlink()
-            print(f"🗑️  Consumed: {file_path.name}")
+            await asyncio.to_thread(file_path.unlink)
+            logger.info("🗑️  Consumed: %s", file_path.name)
         except FileNotFoundError:
             pass
 class NotificationHandler(BaseHandler):
@@ -87,10 +147,11 @@ class NotificationHandler(BaseHandler):
             correlation_id = request.get("correlation_id", "unknown")
             session_id = request["session_id"]
             workspace_path = Path(request["workspace_path"])
+            workspace_path_str = str(workspace_path)  # Bound once for regex, template, callback_data
             workspace_hash = compute_workspace_hash(workspace_path)
 
             # Log notification received event
-            log_event(
+            queue_event(
                 correlation_id,
                 workspace_hash,
                 session_id,
@@ -116,75 +177,42 @@ class NotificationHandler(BaseHandler):
             # Parse error_details for file-level breakdown (progressive disclosure)
             details_lines = []
             if "error_details" in request and request["error_details"]:
-                error_details_str = request["error_details"]
-                for line in error_details_str.strip().split('\n'):
-                    if ':' in line:
-                        file_path, count = line.split(':', 1)
-                        # Shorten path relative to workspace
-                        short_path = file_path.replace(str(workspace_path), '').lstrip('/')
-                        details_lines.append(f"• {short_path} ({count} errors)")
+                # Shorten paths relative to workspace
+                pattern = _error_details_pattern(workspace_path_str)
+                details_lines = [
+                    f"• {m['file']} ({m['count']} errors)"
+                    for m in pattern.finditer(request["error_details"].strip())
+                ]
 
             # Format files affected section
             files_section = ""
             if details_lines:
-                files_section = f"\n\nFiles affected:\n" + '\n'.join(details_lines)
-
-            # Session + debug log lines (two lines, no emoji)
-            # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-            session_line = f"`session={session_id}`"
-            debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-
-            markdown_message = f"""{emoji} **Link Validation** - {ws_name}
-
-**Workspace**: `{workspace_path}`
-{session_line}
-{debug_line}
-
-{details}{files_section}
-
-Choose action:
-"""
+                files_section = "\n".join(("\n\nFiles affected:", *details_lines))
+
+            markdown_message = NOTIFICATION_TEMPLATE.format(
+                emoji=emoji,
+                ws_name=ws_name,
+                workspace_path=workspace_path_str,
+                session_id=session_id,
+                details=details,
+                files_section=files_section
+            )
             message = convert_to_telegram_markdown(markdown_message)
 
             # Create buttons with hash-mapped callbacks (including correlation_id)
+            callback_ids = create_callback_data_batch(
+                workspace_id=workspace_id,
+                workspace_path=workspace_path_str,
+                session_id=session_id,
+                actions=NOTIFICATION_BUTTON_ACTIONS,
+                correlation_id=correlation_id
+            )
             keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "✅ Auto-Fix All",
-                        callback_data=create_callback_data(
-                            workspace_id=workspace_id,
-                            workspace_path=str(workspace_path),
-                            session_id=session_id,
-                            action="auto_fix_all",
-                            correlation_id=correlation_id
-                        )
-                    ),
-                    InlineKeyboardButton(
-                        "❌ Reject",
-                        callback_data=create_callback_data(
-                            workspace_id=workspace_id,
-                            workspace_path=str(workspace_path),
-                            session_id=session_id,
-                            action="reject",
-                            correlation_id=correlation_id
-                        )
-                    )
-                ],
-                [
-                    InlineKeyboardButton(
-                        "📋 View Details",
-                        callback_data=create_callback_data(
-                            workspace_id=workspace_id,
-                            workspace_path=str(workspace_path),
-                            session_id=session_id,
-                            action="view_details",
-                            correlation_id=correlation_id
-                        )
-                    )
-                ]
+                [InlineKeyboardButton(label, callback_data=callback_ids[action]) for label, action in row]
+                for row in NOTIFICATION_BUTTON_ROWS
             ]
 
-            # Send message (AIORateLimiter handles rate limiting automatically)
+            # Send message (ChatRateLimiter handles rate limiting automatically)
             try:
                 await self.bot.send_message(
                     chat_id=self.chat_id,
@@ -192,7 +220,7 @@ Choose action:
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode="MarkdownV2"
                 )
-                print(f"📤 Sent notification for {workspace_id} ({session_id})")
+                logger.info("📤 Sent notification for %s (%s)", workspace_id, session_id)
                 update_activity()  # Track activity for idle timeout
             except Exception as send_error:
                 error_type = type(send_error).__name__
@@ -201,11 +229,11 @@ Choose action:
                 if "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                     # Rate limit hit - send Pushover alert
                     retry_after = getattr(send_error, 'retry_after', 'unknown')
-                    print(f"   ⚠️  RATE LIMIT HIT: Retry after {retry_after}s", file=sys.stderr)
+                    logger.warning("⚠️  RATE LIMIT HIT: Retry after %ss", retry_after)
 
                     # Send Pushover notification (fire-and-forget)
                     import subprocess
-                    notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                    notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                     if notify_script.exists():
                         subprocess.Popen([
                             str(notify_script),
@@ -219,7 +247,7 @@ Choose action:
                 raise
 
             # Log notification processed event
-            log_event(
+            queue_event(
                 correlation_id,
                 workspace_hash,
                 session_id,
@@ -230,7 +258,7 @@ Choose action:
 
         finally:
             # Cleanup consumed notification
-            self._cleanup_file(notification_file)
+            await self._cleanup_file(notification_file)
 
     def _read_notification(self, notification_file: Path) -> Dict[str, Any]:
         """Read and validate notification request."""
@@ -255,15 +283,15 @@ class CompletionHandler(BaseHandler):
         workspace_id = None
 
         try:
-            print(f"🔄 Processing completion: {completion_file.name}")
+            logger.info("🔄 Processing completion: %s", completion_file.name)
 
             # Read completion notification
-            print(f"   📖 Reading completion file...")
+            logger.debug("📖 Reading completion file...")
             completion = self._read_completion(completion_file)
             session_id = completion.get("session_id", "unknown")
             workspace_id = completion.get("workspace_id", "unknown")
 
-            print(f"   ✓ Loaded: workspace={workspace_id}, session={session_id}, status={completion.get('status')}")
+            logger.debug("✓ Loaded: workspace=%s, session=%s, status=%s", workspace_id, session_id, completion.get('status'))
 
             # Load workspace config (with fallback for unregistered workspaces)
             workspace_path = Path(completion.get("workspace_path", "/unknown"))
@@ -271,42 +299,34 @@ class CompletionHandler(BaseHandler):
             emoji = config["emoji"]
 
             # Format message based on status
-            print(f"   ✍️  Formatting completion message...")
+            logger.debug("✍️  Formatting completion message...")
             message = self._format_completion_message(completion, emoji)
-            print(f"   ✓ Message formatted ({len(message)} chars)")
+            logger.debug("✓ Message formatted (%s chars)", len(message))
 
             # Send message with rate limiting and markdown safety
-            print(f"   📡 Sending to Telegram (chat_id={self.chat_id})...")
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode="MarkdownV2"
-            )
+            logger.debug("📡 Sending to Telegram (chat_id=%s)...", self.chat_id)
+            await self._send_text(message)
 
-            print(f"📤 ✅ Sent completion for {workspace_id} ({session_id})")
+            logger.info("📤 ✅ Sent completion for %s (%s)", workspace_id, session_id)
             update_activity()  # Track activity for idle timeout
 
         except Exception as e:
-            error_msg = f"❌ Failed to send completion"
-            if workspace_id:
-                error_msg += f" for {workspace_id}"
-            if session_id:
-                error_msg += f" ({session_id})"
-            error_msg += f": {type(e).__name__}: {e}"
-            print(error_msg, file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
+            logger.exception(
+                "❌ Failed to send completion for %s (%s)",
+                workspace_id, session_id,
+                extra={"workspace_id": workspace_id, "session_id": session_id}
+            )
 
             # Check for rate limit errors and send Pushover alert
             error_type = type(e).__name__
             error_str = str(e)
             if "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                 retry_after = getattr(e, 'retry_after', 'unknown')
-                print(f"   ⚠️  RATE LIMIT DETECTED: Retry after {retry_after}s", file=sys.stderr)
+                logger.warning("⚠️  RATE LIMIT DETECTED: Retry after %ss", retry_after)
 
                 # Send Pushover notification (fire-and-forget)
                 import subprocess
-                notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                 if notify_script.exists():
                     subprocess.Popen([
                         str(notify_script),
@@ -321,7 +341,7 @@ class CompletionHandler(BaseHandler):
 
         finally:
             # Cleanup consumed completion
-            self._cleanup_file(completion_file)
+            await self._cleanup_file(completion_file)
 
     def _read_completion(self, completion_file: Path) -> Dict[str, Any]:
         """Read and validate completion notification."""
@@ -356,17 +376,17 @@ class WorkflowExecutionHandler(BaseHandler):
         workspace_id = None
 
         try:
-            print(f"🔄 Processing execution: {execution_file.name}")
+            logger.info("🔄 Processing execution: %s", execution_file.name)
 
             # Read execution notification
-            print(f"   📖 Reading execution file...")
+            logger.debug("📖 Reading execution file...")
             execution = self._read_execution(execution_file)
             session_id = execution.get("session_id", "unknown")
             workspace_id = execution.get("workspace_id", "unknown")
             workflow_id = execution.get("workflow_id", "unknown")
             workflow_name = execution.get("workflow_name", "unknown")
 
-            print(f"   ✓ Loaded: workspace={workspace_id}, session={session_id}, workflow={workflow_id}, status={execution.get('status')}")
+            logger.debug("✓ Loaded: workspace=%s, session=%s, workflow=%s, status=%s", workspace_id, session_id, workflow_id, execution.get('status'))
 
             # Load workspace config (with fallback for unregistered workspaces)
             workspace_path = Path(execution.get("workspace_path", "/unknown"))
@@ -381,23 +401,23 @@ class WorkflowExecutionHandler(BaseHandler):
             if progress_key in bot_state.active_progress_updates:
                 # Single-message pattern: replace document in existing progress message
                 tracking_context = bot_state.active_progress_updates[progress_key]
-                message_id = tracking_context["message_id"]
-                git_branch = tracking_context.get("git_branch", "unknown")
-                repository_root = tracking_context.get("repository_root", "unknown")
-                working_dir = tracking_context.get("working_directory", ".")
-                workflow_name = tracking_context.get("workflow_name", workflow_id)
-                git_modified = tracking_context.get("git_modified", 0)
-                git_untracked = tracking_context.get("git_untracked", 0)
-                git_staged = tracking_context.get("git_staged", 0)
+                message_id = tracking_context.message_id
+                git_branch = tracking_context.git_branch
+                repository_root = tracking_context.repository_root
+                working_dir = tracking_context.working_directory
+                workflow_name = tracking_context.workflow_name
+                git_modified = tracking_context.git_modified
+                git_untracked = tracking_context.git_untracked
+                git_staged = tracking_context.git_staged
 
                 # Extract preserved context from initial workflow start message
-                user_prompt = tracking_context.get("user_prompt", "")
-                last_response = tracking_context.get("last_response", "")
+                user_prompt = tracking_context.user_prompt
+                last_response = tracking_context.last_response
 
                 # Replace home directory with ~ for cleaner display
                 repo_display = format_repo_display(repository_root)
 
-                print(f"   📝 Updating tracked message (message_id={message_id})")
+                logger.info("📝 Updating tracked message (message_id=%s)", message_id)
 
                 # Build final caption
                 status_emoji_map = {"success": "✅", "error": "❌", "timeout": "⏱️"}
@@ -406,12 +426,9 @@ class WorkflowExecutionHandler(BaseHandler):
                 # Extract summary from execution
                 summary = "Workflow completed"
                 if status == "success" and execution.get("stdout"):
-                    stdout = execution["stdout"].strip()
-                    if stdout:
-                        lines = [l.strip() for l in stdout.split('\n') if l.strip()]
-                        summary = lines[0] if lines else "Workflow completed"
-                        if len(summary) > 100:
-                            summary = summary[:97] + "..."
+                    summary = first_nonempty_line(execution["stdout"]) or "Workflow completed"
+                    if len(summary) > 100:
+                        summary = summary[:97] + "..."
 
                 # Build git status line
                 # Compact git status (always show all counters)
@@ -419,17 +436,7 @@ class WorkflowExecutionHandler(BaseHandler):
 
                 # Session + debug log lines (show both original + headless mode session if present)
                 # Headless mode (-p flag) creates separate session ID for non-interactive execution
-                # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-                headless_session_id = execution.get("headless_session_id")
-                if headless_session_id:
-                    session_line = f"`session={session_id}`"
-                    headless_line = f"`headless={headless_session_id}`"
-                    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-                    session_debug_lines = f"{session_line}\n{headless_line}\n{debug_line}"
-                else:
-                    session_line = f"`session={session_id}`"
-                    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-                    session_debug_lines = f"{session_line}\n{debug_line}"
+                session_debug_lines = format_session_lines(session_id, execution.get("headless_session_id"))
 
                 # Build original context section (user prompt + assistant response)
                 original_context = ""
@@ -453,7 +460,7 @@ class WorkflowExecutionHandler(BaseHandler):
                 final_caption = convert_to_telegram_markdown(markdown_caption)
 
                 # Update message text with final status
-                print(f"   📝 Updating message with final status...")
+                logger.debug("📝 Updating message with final status...")
                 try:
                     await self.bot.edit_message_text(
                         chat_id=self.chat_id,
@@ -461,7 +468,7 @@ class WorkflowExecutionHandler(BaseHandler):
                         text=final_caption,
                         parse_mode="MarkdownV2"
                     )
-                    print(f"   ✅ Message updated successfully")
+                    logger.info("✅ Message updated successfully")
                 except Exception as edit_error:
                     error_type = type(edit_error).__name__
                     error_str = str(edit_error)
@@ -469,11 +476,11 @@ class WorkflowExecutionHandler(BaseHandler):
                     if "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                         # Rate limit hit - send Pushover alert
                         retry_after = getattr(edit_error, 'retry_after', 'unknown')
-                        print(f"   ⚠️  RATE LIMIT HIT: Retry after {retry_after}s", file=sys.stderr)
+                        logger.warning("⚠️  RATE LIMIT HIT: Retry after %ss", retry_after)
 
                         # Send Pushover notification (fire-and-forget)
                         import subprocess
-                        notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                        notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                         if notify_script.exists():
                             subprocess.Popen([
                                 str(notify_script),
@@ -486,21 +493,15 @@ class WorkflowExecutionHandler(BaseHandler):
                     # Re-raise all errors
                     raise
 
-                # Cleanup tracking (memory + file)
-                del bot_state.active_progress_updates[progress_key]
-
-                # Remove tracking file
-                tracking_file = TRACKING_DIR / f"{workspace_id}_{session_id}_{workflow_id}_tracking.json"
-                if tracking_file.exists():
-                    tracking_file.unlink()
-                    print(f"   🗑️  Progress tracking cleaned up (memory + file)")
-                else:
-                    print(f"   🗑️  Progress tracking cleaned up (memory only)")
+                # Cleanup tracking (memory + state store)
+                bot_state.active_progress_updates.pop(progress_key, None)
+                state_store.queue_write(state_store.delete_tracking, progress_key)
+                logger.info("🗑️  Progress tracking cleaned up (memory + state store)")
 
             else:
                 # No active progress tracking - send fallback notification
-                print(f"   ⚠️  WARNING: No progress tracking found for {progress_key}")
-                print(f"   Sending fallback notification (new message without progress context)")
+                logger.warning("⚠️  WARNING: No progress tracking found for %s", progress_key)
+                logger.info("Sending fallback notification (new message without progress context)")
 
                 # Build fallback message (without git status or progress context)
                 status_emoji_map = {"success": "✅", "error": "❌", "timeout": "⏱️"}
@@ -509,25 +510,12 @@ class WorkflowExecutionHandler(BaseHandler):
                 # Extract summary from execution
                 summary = "Workflow completed"
                 if status == "success" and execution.get("stdout"):
-                    stdout = execution["stdout"].strip()
-                    if stdout:
-                        lines = [l.strip() for l in stdout.split('\n') if l.strip()]
-                        summary = lines[0] if lines else "Workflow completed"
-                        if len(summary) > 100:
-                            summary = summary[:97] + "..."
+                    summary = first_nonempty_line(execution["stdout"]) or "Workflow completed"
+                    if len(summary) > 100:
+                        summary = summary[:97] + "..."
 
                 # Session + debug log lines (two or three lines, no emoji)
-                # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-                headless_session_id = execution.get("headless_session_id")
-                if headless_session_id:
-                    session_line = f"`session={session_id}`"
-                    headless_line = f"`headless={headless_session_id}`"
-                    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-                    session_debug_lines = f"{session_line}\n{headless_line}\n{debug_line}"
-                else:
-                    session_line = f"`session={session_id}`"
-                    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-                    session_debug_lines = f"{session_line}\n{debug_line}"
+                session_debug_lines = format_session_lines(session_id, execution.get("headless_session_id"))
 
                 markdown_fallback = (
                     f"📨 **Workflow Completed** (recovered execution)\n\n"
@@ -543,12 +531,8 @@ class WorkflowExecutionHandler(BaseHandler):
 
                 # Send new message (not updating existing message)
                 try:
-                    await self.bot.send_message(
-                        chat_id=self.chat_id,
-                        text=fallback_message,
-                        parse_mode="MarkdownV2"
-                    )
-                    print(f"   ✅ Fallback notification sent")
+                    await self._send_text(fallback_message)
+                    logger.info("✅ Fallback notification sent")
                 except Exception as send_error:
                     error_type = type(send_error).__name__
                     error_str = str(send_error)
@@ -556,11 +540,11 @@ class WorkflowExecutionHandler(BaseHandler):
                     if "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                         # Rate limit hit - send Pushover alert
                         retry_after = getattr(send_error, 'retry_after', 'unknown')
-                        print(f"   ⚠️  RATE LIMIT HIT: Retry after {retry_after}s", file=sys.stderr)
+                        logger.warning("⚠️  RATE LIMIT HIT: Retry after %ss", retry_after)
 
                         # Send Pushover notification (fire-and-forget)
                         import subprocess
-                        notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                        notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                         if notify_script.exists():
                             subprocess.Popen([
                                 str(notify_script),
@@ -573,25 +557,21 @@ class WorkflowExecutionHandler(BaseHandler):
                     # Re-raise all errors
                     raise
 
-            print(f"📤 ✅ Sent execution completion for {workspace_id} ({session_id}): {workflow_name}")
+            logger.info("📤 ✅ Sent execution completion for %s (%s): %s", workspace_id, session_id, workflow_name)
             update_activity()  # Track activity for idle timeout
 
-        except Exception as e:
-            error_msg = f"❌ Failed to send execution completion"
-            if workspace_id:
-                error_msg += f" for {workspace_id}"
-            if session_id:
-                error_msg += f" ({session_id})"
-            error_msg += f": {type(e).__name__}: {e}"
-            print(error_msg, file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
+        except Exception:
+            logger.exception(
+                "❌ Failed to send execution completion for %s (%s)",
+                workspace_id, session_id,
+                extra={"workspace_id": workspace_id, "session_id": session_id}
+            )
             # Re-raise to let caller handle
             raise
 
         finally:
             # Cleanup consumed execution
-            self._cleanup_file(execution_file)
+            await self._cleanup_file(execution_file)
 
     def _read_execution(self, execution_file: Path) -> Dict[str, Any]:
         """Read and validate WorkflowExecution file."""
@@ -628,10 +608,11 @@ class SummaryHandler(BaseHandler):
             correlation_id = summary.get("correlation_id", "unknown")
             session_id = summary["session_id"]
             workspace_path = Path(summary["workspace_path"])
+            workspace_path_str = str(workspace_path)
             workspace_hash = summary["workspace_id"]
 
             # Log summary received event
-            log_event(
+            queue_event(
                 correlation_id,
                 workspace_hash,
                 session_id,
@@ -640,11 +621,12 @@ class SummaryHandler(BaseHandler):
                 {"summary_file": summary_file.name}
             )
 
-            # Filter available workflows
+            # Filter available workflows (picks up workflows.json edits without restart)
+            bot_state.workflow_registry = refresh_workflow_registry(WORKFLOWS_REGISTRY, bot_state.workflow_registry)
             available_workflows = filter_workflows_by_triggers(bot_state.workflow_registry, summary)
 
             if not available_workflows:
-                print(f"⚠️  No workflows available for session {session_id} (no triggers matched)")
+                logger.warning("⚠️  No workflows available for session %s (no triggers matched)", session_id)
                 # Don't send message if no workflows available
                 return
 
@@ -654,7 +636,7 @@ class SummaryHandler(BaseHandler):
             # ALWAYS use workspace hash for tracking consistency
             # (Execution files from orchestrator use hash, so tracking must too)
             workspace_id = workspace_hash
-            print(f"   🔍 DEBUG: workspace_hash={workspace_hash}, workspace_id={workspace_id}")
+            logger.debug("🔍 workspace_hash=%s, workspace_id=%s", workspace_hash, workspace_id)
 
             # Load workspace config for display only (emoji, name)
             config = get_workspace_config(workspace_path=workspace_path, include_name=True)
@@ -667,7 +649,7 @@ class SummaryHandler(BaseHandler):
             duration = summary.get("duration_seconds", 0)
 
             # Extract repository root and working directory (industry standard distinction)
-            repository_root = summary.get("repository_root", str(workspace_path))
+            repository_root = summary.get("repository_root", workspace_path_str)
             working_dir = summary.get("working_directory", ".")
 
             # Extract conversation from transcript for better context
@@ -675,8 +657,8 @@ class SummaryHandler(BaseHandler):
             transcript_path = Path(summary_file.parent.parent.parent / "projects" /
                                    summary_file.name.replace("summary_", "").replace(".json", ".jsonl"))
 
-            print(f"   🔍 DEBUG: Transcript path derived: {transcript_path}")
-            print(f"   🔍 DEBUG: Transcript exists: {transcript_path.exists()}")
+            logger.debug("🔍 Transcript path derived: %s", transcript_path)
+            logger.debug("🔍 Transcript exists: %s", transcript_path.exists())
 
             conversation = None
             try:
@@ -687,61 +669,65 @@ class SummaryHandler(BaseHandler):
                     last_response = conversation['assistant_response']
 
                     # DEBUG: Log raw extraction results
-                    print(f"   📝 Extracted conversation from transcript ({conversation['message_count']} messages)")
-                    print(f"   🔍 DEBUG RAW user_prompt (len={len(user_prompt)}): {repr(user_prompt[:200])}")
-                    print(f"   🔍 DEBUG RAW last_response (len={len(last_response)}): {repr(last_response[:200])}")
+                    logger.info("📝 Extracted conversation from transcript (%s messages)", conversation['message_count'])
+                    logger.debug("🔍 RAW user_prompt (len=%s): %r", len(user_prompt), user_prompt[:200])
+                    logger.debug("🔍 RAW last_response (len=%s): %r", len(last_response), last_response[:200])
                 else:
                     # Fallback to summary fields (may be generic)
                     user_prompt = summary.get("last_user_prompt", "")
                     last_response = summary.get("last_response", "Session completed")
-                    print(f"   ⚠️  Transcript not found, using summary fields")
-                    print(f"   🔍 DEBUG FALLBACK user_prompt: {repr(user_prompt[:200])}")
+                    logger.warning("⚠️  Transcript not found, using summary fields")
+                    logger.debug("🔍 FALLBACK user_prompt: %r", user_prompt[:200])
             except (FileNotFoundError, ValueError, KeyError) as e:
                 # Fallback on any extraction error - use summary fields instead
-                print(f"   ⚠️  Transcript extraction failed: {e}")
-                print(f"   ⏭️  Using summary fallback fields")
+                logger.warning("⚠️  Transcript extraction failed: %s", e)
+                logger.info("⏭️  Using summary fallback fields")
                 user_prompt = summary.get("last_user_prompt", "")
                 last_response = summary.get("last_response", "Session completed")
-                print(f"   🔍 DEBUG EXCEPTION FALLBACK user_prompt: {repr(user_prompt[:200])}")
-                print(f"   🔍 DEBUG EXCEPTION FALLBACK last_response: {repr(last_response[:200])}")
+                logger.debug("🔍 EXCEPTION FALLBACK user_prompt: %r", user_prompt[:200])
+                logger.debug("🔍 EXCEPTION FALLBACK last_response: %r", last_response[:200])
+
+            # Build git porcelain display (up to 10 lines)
+            git_porcelain_display = format_git_porcelain_display(git_status.get('porcelain', []))
+
+            # Build compact git status line (always show all counters)
+            modified = git_status.get('modified_files', 0)
+            staged = git_status.get('staged_files', 0)
+            untracked = git_status.get('untracked_files', 0)
+
+            # Show all counters even when zero for clarity
+            git_compact = format_git_status_compact(modified, staged, untracked)
 
             # Cache summary data for workflow selection (needed because we delete summary file)
+            # Rendered git strings are cached too so the start message doesn't rebuild them
             cache_key = (workspace_id, session_id)
-            bot_state.summary_cache[cache_key] = {
+            summary_data = {
                 "session_id": session_id,
                 "correlation_id": correlation_id,
                 "git_status": git_status,
                 "lychee_status": lychee_status,
-                "workspace_path": str(workspace_path),
+                "workspace_path": workspace_path_str,
                 "duration_seconds": duration,
                 "repository_root": repository_root,
                 "working_directory": working_dir,
                 "last_user_prompt": user_prompt,
-                "last_response": last_response
+                "last_response": last_response,
+                "git_porcelain_display": git_porcelain_display,
+                "git_compact": git_compact
             }
-            print(f"   📦 Cached summary for {cache_key}")
-
-            # Build git porcelain display (up to 10 lines)
-            git_porcelain_lines = git_status.get('porcelain', [])
-            git_porcelain_display = ""
-            if git_porcelain_lines:
-                # Limit to first 10 lines to avoid huge messages
-                display_lines = git_porcelain_lines[:10]
-                porcelain_text = "\n".join(display_lines)
-                if len(git_porcelain_lines) > 10:
-                    porcelain_text += f"\n... and {len(git_porcelain_lines) - 10} more"
-                # Wrap in code block for proper formatting
-                git_porcelain_display = f"\n```\n{porcelain_text}\n```"
+            bot_state.cache_summary(cache_key, summary_data)
+            state_store.queue_write(state_store.save_summary, cache_key, summary_data)
+            logger.info("📦 Cached summary for %s", cache_key)
 
             # Replace home directory with ~ for cleaner display
             repo_display = format_repo_display(repository_root)
 
             # Process user prompt with markdown safety (truncate-first pattern from CCR)
             if user_prompt:
-                print(f"   🔍 DEBUG BEFORE truncate: {repr(user_prompt[:150])}")
+                logger.debug("🔍 BEFORE truncate: %r", user_prompt[:150])
                 user_result = truncate_markdown_safe(user_prompt, max_length=100)
                 user_prompt = user_result['text']
-                print(f"   🔍 DEBUG AFTER truncate: {repr(user_prompt[:150])}")
+                logger.debug("🔍 AFTER truncate: %r", user_prompt[:150])
 
             # Process last response with markdown safety (truncate-first pattern from CCR)
             # This preserves Claude's original formatting (bold, code, italic)
@@ -750,15 +736,7 @@ class SummaryHandler(BaseHandler):
 
             # Log if tags were auto-closed (observability SLO)
             if response_result['tags_closed']:
-                print(f"   🔧 Auto-closed markdown tags: {response_result['tags_closed']}")
-
-            # Build compact git status line (always show all counters)
-            modified = git_status.get('modified_files', 0)
-            staged = git_status.get('staged_files', 0)
-            untracked = git_status.get('untracked_files', 0)
-
-            # Show all counters even when zero for clarity
-            git_compact = format_git_status_compact(modified, staged, untracked)
+                logger.info("🔧 Auto-closed markdown tags: %s", response_result['tags_closed'])
 
             # Get lychee details
             lychee_details = lychee_status.get('details', 'Not run')
@@ -766,33 +744,28 @@ class SummaryHandler(BaseHandler):
             # Build message with user prompt as first line if available
             # Use plain text without markdown formatting to avoid MarkdownV2 parsing issues
             # Replace newlines with spaces for single-line display
-            print(f"   🔍 DEBUG user_prompt before prompt_line: {repr(user_prompt)}")
+            logger.debug("🔍 user_prompt before prompt_line: %r", user_prompt)
             prompt_line = f"❓ {user_prompt.replace(chr(10), ' ').strip()}\n" if user_prompt else ""
-            print(f"   🔍 DEBUG prompt_line result: {repr(prompt_line)}")
-
-            # Session + debug log lines (two lines, no emoji)
-            # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-            session_line = f"`session={session_id}`"
-            debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
+            logger.debug("🔍 prompt_line result: %r", prompt_line)
 
             # Display response with preserved formatting
             markdown_message = f"""{prompt_line}{emoji} {last_response}
 
 `{repo_display}` | `{working_dir}`
-{session_line}
-{debug_line} ({duration}s)
+`session={session_id}`
+{DEBUG_LOG_LINE} ({duration}s)
 **↯**: `{git_status.get('branch', 'unknown')}` | {git_compact}{git_porcelain_display}
 
 **Lychee**: {lychee_details}
 
 **Available Workflows** ({len(available_workflows)}):
 """
-            print(f"   🔍 DEBUG markdown_message (first 300 chars): {repr(markdown_message[:300])}")
+            logger.debug("🔍 markdown_message (first 300 chars): %r", markdown_message[:300])
             message = convert_to_telegram_markdown(markdown_message)
-            print(f"   🔍 DEBUG converted message (first 300 chars): {repr(message[:300])}")
+            logger.debug("🔍 converted message (first 300 chars): %r", message[:300])
 
             # Build dynamic keyboard
-            print(f"   🔍 DEBUG: Before _build_workflow_keyboard, workspace_id={workspace_id}")
+            logger.debug("🔍 Before _build_workflow_keyboard, workspace_id=%s", workspace_id)
             keyboard = self._build_workflow_keyboard(
                 available_workflows,
                 workspace_id,
@@ -801,8 +774,8 @@ class SummaryHandler(BaseHandler):
                 correlation_id
             )
 
-            # Send message (AIORateLimiter handles rate limiting automatically)
-            print(f"   📡 Sending to Telegram (chat_id={self.chat_id}, message_len={len(message)} chars)...")
+            # Send message (ChatRateLimiter handles rate limiting automatically)
+            logger.debug("📡 Sending to Telegram (chat_id=%s, message_len=%s chars)...", self.chat_id, len(message))
             try:
                 sent_message = await self.bot.send_message(
                     chat_id=self.chat_id,
@@ -810,9 +783,9 @@ class SummaryHandler(BaseHandler):
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode="MarkdownV2"
                 )
-                print(f"   ✅ Telegram API responded: message_id={sent_message.message_id}, chat_id={sent_message.chat_id}")
+                logger.info("✅ Telegram API responded: message_id=%s, chat_id=%s", sent_message.message_id, sent_message.chat_id)
 
-                print(f"📤 Sent workflow menu for {workspace_id} ({session_id}): {len(available_workflows)} workflows")
+                logger.info("📤 Sent workflow menu for %s (%s): %s workflows", workspace_id, session_id, len(available_workflows))
                 update_activity()
             except Exception as send_error:
                 error_type = type(send_error).__name__
@@ -821,11 +794,11 @@ class SummaryHandler(BaseHandler):
                 if "RetryAfter" in error_type or "429" in error_str or "Too Many Requests" in error_str:
                     # Rate limit hit - send Pushover alert
                     retry_after = getattr(send_error, 'retry_after', 'unknown')
-                    print(f"   ⚠️  RATE LIMIT HIT: Retry after {retry_after}s", file=sys.stderr)
+                    logger.warning("⚠️  RATE LIMIT HIT: Retry after %ss", retry_after)
 
                     # Send Pushover notification (fire-and-forget)
                     import subprocess
-                    notify_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "bot" / "notify-rate-limit.sh"
+                    notify_script = NOTIFY_RATE_LIMIT_SCRIPT
                     if notify_script.exists():
                         subprocess.Popen([
                             str(notify_script),
@@ -839,7 +812,7 @@ class SummaryHandler(BaseHandler):
                 raise
 
             # Log summary processed event
-            log_event(
+            queue_event(
                 correlation_id,
                 workspace_hash,
                 session_id,
@@ -850,7 +823,7 @@ class SummaryHandler(BaseHandler):
 
         finally:
             # Cleanup consumed summary
-            self._cleanup_file(summary_file)
+            await self._cleanup_file(summary_file)
 
     def _read_summary(self, summary_file: Path) -> Dict[str, Any]:
         """Read and validate session summary."""
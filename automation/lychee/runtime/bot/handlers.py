@@ -5,20 +5,196 @@ Action handlers for button clicks and workflow selections.
 """
 
 import asyncio
-import json
-import os
-import sys
+import atexit
+import contextlib
+import logging
+import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO, List, Optional, Set, TextIO
 
+import ijson
+import orjson
 from telegram.ext import ContextTypes
 
 import bot_state
+import state_store
 from workspace_helpers import compute_workspace_hash
 from format_utils import get_workspace_config, convert_to_telegram_markdown
-from bot_utils import log_event
+from bot_utils import queue_event, write_json_atomic
 from message_builders import build_workflow_start_message
 
+# Module-level constants
+ORCHESTRATOR_SCRIPT = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "orchestrator" / "multi-workspace-orchestrator.py"
+ORCHESTRATOR_LOG = Path.home() / ".claude" / "automation" / "lychee" / "logs" / "orchestrator.log"
+
+logger = logging.getLogger("lychee.bot")
+
+# Detailed breakdown budget (Telegram has 4096 char limit for messages)
+DETAILS_MAX_CHARS = 3800
+
+# Directories already created by this process (skip mkdir syscalls per callback)
+_ready_dirs: Set[Path] = set()
+
+# Orchestrator log opened once in append mode and shared by all spawned children
+_orchestrator_log_fd: Optional[TextIO] = None
+
+# Persistent orchestrator worker fed one JSON request per stdin line
+_orchestrator_worker: Optional[subprocess.Popen] = None
+
+
+def _ensure_dir(directory: Path) -> None:
+    """Create directory once per process."""
+    if directory not in _ready_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ready_dirs.add(directory)
+
+
+def _get_orchestrator_log() -> TextIO:
+    """Return the shared orchestrator log handle (opened on first use, closed at exit)."""
+    global _orchestrator_log_fd
+    if _orchestrator_log_fd is None:
+        _ensure_dir(ORCHESTRATOR_LOG.parent)
+        _orchestrator_log_fd = open(ORCHESTRATOR_LOG, 'a')
+        atexit.register(_orchestrator_log_fd.close)
+    return _orchestrator_log_fd
+
+
+def start_orchestrator_worker() -> subprocess.Popen:
+    """
+    Return the running orchestrator worker, starting it if absent or exited.
+
+    A plain Popen rather than an asyncio subprocess: the worker must outlive
+    the bot's event loop (asyncio kills children whose transport is closed),
+    so workflows still running at idle shutdown finish once stdin hits EOF.
+    Output goes to the shared orchestrator log rather than pipes nobody
+    reads (a child writing >64KB into an unread PIPE blocks forever).
+
+    Returns:
+        Worker process with stdin open for requests
+    """
+    global _orchestrator_worker
+    if _orchestrator_worker is None or _orchestrator_worker.poll() is not None:
+        if _orchestrator_worker is not None:
+            logger.warning(
+                "Orchestrator worker exited with code %d (PID: %d), restarting",
+                _orchestrator_worker.returncode, _orchestrator_worker.pid
+            )
+        log_fd = _get_orchestrator_log()
+        _orchestrator_worker = subprocess.Popen(
+            [str(ORCHESTRATOR_SCRIPT), "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=log_fd,
+            stderr=log_fd
+        )
+        logger.info("✓ Orchestrator worker started (PID: %s)", _orchestrator_worker.pid)
+    return _orchestrator_worker
+
+
+def stop_orchestrator_worker() -> None:
+    """
+    Close the worker's stdin without waiting (in-flight workflows finish, then it exits).
+    """
+    global _orchestrator_worker
+    if _orchestrator_worker is not None:
+        with contextlib.suppress(OSError):
+            _orchestrator_worker.stdin.close()
+        _orchestrator_worker = None
+
+
+async def dispatch_to_orchestrator(request_file: Path, correlation_id: str) -> None:
+    """
+    Hand a selection or approval file to the persistent orchestrator worker.
+
+    One line write per request instead of an interpreter start per click.
+    A dead worker (crash, manual kill) is restarted and the write retried once.
+
+    Args:
+        request_file: Selection or approval file to process
+        correlation_id: Correlation ID propagated inline with the request
+    """
+    logger.info("🚀 Dispatching to orchestrator: %s", request_file.name)
+    request_line = orjson.dumps({"file": str(request_file), "correlation_id": correlation_id}) + b"\n"
+
+    for attempt in range(2):
+        try:
+            worker = start_orchestrator_worker()
+            worker.stdin.write(request_line)
+            worker.stdin.flush()
+            return
+        except BrokenPipeError:
+            stop_orchestrator_worker()
+            if attempt == 0:
+                logger.warning("Orchestrator worker pipe closed, restarting for %s", request_file.name)
+                continue
+            logger.exception("   ❌ Orchestrator worker rejected %s", request_file.name)
+        except Exception:
+            logger.exception("   ❌ Failed to dispatch %s to orchestrator", request_file.name)
+            return
+
+
+def _read_error_details(json_results: Path, workspace_path: str) -> List[str]:
+    """Open a lychee results file and stream its error details (blocking)."""
+    with open(json_results, 'rb') as f:
+        return _collect_error_details(f, workspace_path)
+
+
+def _collect_error_details(f: BinaryIO, workspace_path: str) -> List[str]:
+    """
+    Stream lychee error_map into display lines within DETAILS_MAX_CHARS.
+
+    Stops reading as soon as the budget is spent and appends a truncation
+    marker, so the rest of a large results file is never parsed.
+
+    Args:
+        f: Lychee JSON results file opened in binary mode
+        workspace_path: Absolute path to workspace (stripped from paths/URLs)
+
+    Returns:
+        Display lines (empty if error_map is missing or empty)
+
+    Raises:
+        ijson.JSONError: If results file is not valid JSON
+    """
+    details_lines: List[str] = []
+    running_len = 0
+    # use_float: numbers (e.g. status codes) as float/int, not Decimal
+    for file_path, errors in ijson.kvitems(f, 'error_map', use_float=True):
+        # Shorten path relative to workspace
+        short_path = file_path.removeprefix(workspace_path).lstrip('/')
+        file_lines = [f"\n**{short_path}** ({len(errors)} errors):"]
+
+        for error in errors[:5]:  # Limit to 5 errors per file to avoid huge messages
+            url = error.get("url", "unknown")
+            status = error.get("status", {})
+            error_text = status.get("text", "Unknown error")
+
+            # Shorten URL for display (prefix checks, no full-string scans)
+            display_url = url.removeprefix("file://")
+            if display_url.startswith(workspace_path):
+                display_url = "..." + display_url[len(workspace_path):]
+            file_lines.extend((f"  • `{display_url}`", f"    {error_text}"))
+
+        if len(errors) > 5:
+            file_lines.append(f"  ... and {len(errors) - 5} more errors")
+
+        # Whole file's lines fit: one extend instead of a budget check per line
+        file_len = sum(map(len, file_lines)) + len(file_lines)  # +1 per joining newline
+        if running_len + file_len <= DETAILS_MAX_CHARS:
+            details_lines.extend(file_lines)
+            running_len += file_len
+            continue
+
+        # Budget runs out within this file: keep the lines that still fit
+        for line in file_lines:
+            running_len += len(line) + 1  # +1 for the joining newline
+            if running_len > DETAILS_MAX_CHARS:
+                details_lines.append("\n... (truncated)")
+                return details_lines
+            details_lines.append(line)
+
+    return details_lines
+
 
 async def handle_view_details(query, workspace_path: str, session_id: str, correlation_id: str):
     """
@@ -52,10 +228,12 @@ async def handle_view_details(query, workspace_path: str, session_id: str, corre
         )
         return
 
+    # Stream error_map instead of parsing the whole results file: only the
+    # first DETAILS_MAX_CHARS are ever displayed, and large projects produce MBs.
+    # Read off the event loop (cold page cache on a big file is slow)
     try:
-        with open(json_results, 'r') as f:
-            lychee_data = json.load(f)
-    except json.JSONDecodeError as e:
+        details_lines = await asyncio.to_thread(_read_error_details, json_results, workspace_path)
+    except ijson.JSONError as e:
         markdown_msg = (
             f"❌ Failed to parse lychee JSON output\n\n"
             f"Error: {e}\n\n"
@@ -67,10 +245,7 @@ async def handle_view_details(query, workspace_path: str, session_id: str, corre
         )
         raise  # Fail-fast
 
-    # Format error_map as readable text
-    error_map = lychee_data.get("error_map", {})
-
-    if not error_map:
+    if not details_lines:
         markdown_msg = (
             "✅ No detailed errors found\n\n"
             "The error_map is empty. All links may have been fixed."
@@ -81,39 +256,14 @@ async def handle_view_details(query, workspace_path: str, session_id: str, corre
         )
         return
 
-    # Build detailed breakdown
-    details_lines = []
-    for file_path, errors in error_map.items():
-        # Shorten path relative to workspace
-        short_path = file_path.replace(workspace_path, '').lstrip('/')
-        details_lines.append(f"\n**{short_path}** ({len(errors)} errors):")
-
-        for error in errors[:5]:  # Limit to 5 errors per file to avoid huge messages
-            url = error.get("url", "unknown")
-            status = error.get("status", {})
-            error_text = status.get("text", "Unknown error")
-
-            # Shorten URL for display
-            display_url = url.replace("file://", "").replace(workspace_path, "...")
-            details_lines.append(f"  • `{display_url}`")
-            details_lines.append(f"    {error_text}")
-
-        if len(errors) > 5:
-            details_lines.append(f"  ... and {len(errors) - 5} more errors")
-
     details_text = '\n'.join(details_lines)
-
-    # Truncate if too long (Telegram has 4096 char limit for messages)
-    if len(details_text) > 3800:
-        details_text = details_text[:3800] + "\n\n... (truncated)"
-
     markdown_msg = f"📋 **Detailed Error Breakdown**\n{details_text}"
     await query.message.reply_text(
         convert_to_telegram_markdown(markdown_msg),
         parse_mode='MarkdownV2'
     )
 
-    print(f"📋 Sent detailed breakdown for session {session_id}")
+    logger.info("📋 Sent detailed breakdown for session %s", session_id)
 
 
 async def handle_workflow_selection(
@@ -124,8 +274,7 @@ async def handle_workflow_selection(
     action: str,
     correlation_id: str,
     context: ContextTypes.DEFAULT_TYPE,
-    selections_dir: Path,
-    tracking_dir: Path
+    selections_dir: Path
 ) -> None:
     """
     Handle workflow selection button click.
@@ -141,7 +290,6 @@ async def handle_workflow_selection(
         correlation_id: Correlation ID for tracing
         context: Bot context for accessing bot instance
         selections_dir: Selections directory path
-        tracking_dir: Tracking directory path
 
     Raises:
         All errors propagate (fail-fast)
@@ -172,7 +320,7 @@ async def handle_workflow_selection(
     cache_key = (workspace_id, session_id)
     summary_data = bot_state.summary_cache.get(cache_key)
     if not summary_data:
-        print(f"   ⚠️  Summary not found in cache for {cache_key}, orchestrator may fail")
+        logger.warning("⚠️  Summary not found in cache for %s, orchestrator may fail", cache_key)
         summary_data = {}
 
     selection_state = {
@@ -189,13 +337,15 @@ async def handle_workflow_selection(
         }
     }
 
-    selections_dir.mkdir(parents=True, exist_ok=True)
-    selection_file.write_text(json.dumps(selection_state, indent=2))
+    _ensure_dir(selections_dir)
+    # Write atomically (write to temp file, then rename) so readers never see partial JSON;
+    # off the event loop so concurrent callbacks aren't stalled by disk I/O
+    await asyncio.to_thread(write_json_atomic, selection_file, selection_state)
 
-    print(f"✅ Selection file written: {selection_file.name}")
+    logger.info("✅ Selection file written: %s", selection_file.name)
 
     # Log selection created event
-    log_event(
+    queue_event(
         correlation_id,
         workspace_hash,
         session_id,
@@ -204,34 +354,8 @@ async def handle_workflow_selection(
         {"workflow_id": workflow_id, "selection_file": selection_file.name}
     )
 
-    # Start orchestrator in background to process selection
-    orchestrator_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "orchestrator" / "multi-workspace-orchestrator.py"
-    print(f"🚀 Starting orchestrator: {orchestrator_script}")
-
-    try:
-        # Start orchestrator in background (one-shot execution)
-        # Propagate correlation_id via environment for distributed tracing
-        env = os.environ.copy()
-        env["CORRELATION_ID"] = correlation_id
-
-        # Redirect stdout/stderr to orchestrator log file (avoid pipe blocking)
-        log_file = Path.home() / ".claude" / "automation" / "lychee" / "logs" / "orchestrator.log"
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(log_file, 'a') as log_fd:
-            process = await asyncio.create_subprocess_exec(
-                str(orchestrator_script),
-                str(selection_file),
-                stdout=log_fd,
-                stderr=log_fd,
-                env=env
-            )
-            print(f"   ✓ Orchestrator started (PID: {process.pid})")
-            # Don't wait for completion - orchestrator runs independently
-    except Exception as e:
-        print(f"   ❌ Failed to start orchestrator: {type(e).__name__}: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+    # Hand selection to the orchestrator worker (processed in background)
+    await dispatch_to_orchestrator(selection_file, correlation_id)
 
     # Confirm to user (with fallback for unregistered workspaces)
     config = get_workspace_config(workspace_id=workspace_id)
@@ -263,7 +387,7 @@ async def handle_workflow_selection(
     )
     message_id = sent_message.message_id
 
-    print(f"✅ Workflow selected: {workflow_id} for workspace: {workspace_id}")
+    logger.info("✅ Workflow selected: %s for workspace: %s", workflow_id, workspace_id)
 
     # Track message_id and context for progress updates
     # MUST use workspace_hash to match execution files from orchestrator
@@ -283,25 +407,24 @@ async def handle_workflow_selection(
     user_prompt = summary_data.get("last_user_prompt", "")
     last_response = summary_data.get("last_response", "")
 
-    tracking_data = {
-        "message_id": message_id,
-        "workspace_id": workspace_hash,  # Use hash to match execution files
-        "repository_root": repository_root,
-        "working_directory": working_dir,
-        "git_branch": git_branch,
-        "git_modified": git_modified,
-        "git_untracked": git_untracked,
-        "git_staged": git_staged,
-        "workflow_name": workflow_name if bot_state.workflow_registry and workflow_id in bot_state.workflow_registry["workflows"] else workflow_id,
-        "session_id": session_id,
-        "user_prompt": user_prompt,  # Preserve for completion message
-        "last_response": last_response  # Preserve for completion message
-    }
+    tracking_entry = bot_state.TrackingEntry(
+        message_id=message_id,
+        workspace_id=workspace_hash,  # Use hash to match execution files
+        session_id=session_id,
+        workflow_id=workflow_id,  # Restored directly (no filename parsing)
+        workflow_name=workflow_name if bot_state.workflow_registry and workflow_id in bot_state.workflow_registry["workflows"] else workflow_id,
+        repository_root=repository_root,
+        working_directory=working_dir,
+        git_branch=git_branch,
+        git_modified=git_modified,
+        git_untracked=git_untracked,
+        git_staged=git_staged,
+        user_prompt=user_prompt,
+        last_response=last_response
+    )
 
-    bot_state.active_progress_updates[progress_key] = tracking_data
+    bot_state.track_progress(progress_key, tracking_entry)
 
     # Persist tracking data to survive bot restarts (watchexec)
-    tracking_dir.mkdir(parents=True, exist_ok=True)
-    tracking_file = tracking_dir / f"{workspace_hash}_{session_id}_{workflow_id}_tracking.json"  # Use hash in filename
-    tracking_file.write_text(json.dumps(tracking_data, indent=2))
-    print(f"   📌 Tracking progress updates (message_id={message_id}, branch={git_branch})")
+    state_store.queue_write(state_store.save_tracking, progress_key, tracking_entry.to_dict())
+    logger.info("📌 Tracking progress updates (message_id=%s, branch=%s)", message_id, git_branch)
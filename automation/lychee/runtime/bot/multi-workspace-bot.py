@@ -2,10 +2,14 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "python-telegram-bot[rate-limiter]>=21.0",
+#     "python-telegram-bot[rate-limiter,webhooks]>=21.0",
 #     "jsonschema>=4.0.0",
 #     "psutil>=7.0.0",
 #     "telegramify-markdown>=0.5.2",
+#     "orjson>=3.10.0",
+#     "ijson>=3.3.0",
+#     "watchfiles>=0.21.0",
+#     "python-ulid>=2.7.0",
 # ]
 # ///
 """
@@ -56,17 +60,18 @@ Changes from v3.0.0:
 """
 
 import asyncio
-import json
+import contextlib
+import logging
 import os
 import signal
-import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
 
 from telegram import Bot, Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CallbackQueryHandler, ContextTypes, AIORateLimiter, PicklePersistence
+from telegram.ext import Application, CallbackQueryHandler, ContextTypes, PicklePersistence
 
 # Force unbuffered output
 sys.stdout.reconfigure(line_buffering=True)
@@ -81,7 +86,8 @@ SUMMARIES_DIR = STATE_DIR / "summaries"  # Phase 3 - v4.0.0
 SELECTIONS_DIR = STATE_DIR / "selections"  # Phase 3 - v4.0.0
 EXECUTIONS_DIR = STATE_DIR / "executions"  # Phase 4 - WorkflowExecution results
 PROGRESS_DIR = STATE_DIR / "progress"  # Phase 4 - P2 streaming progress
-TRACKING_DIR = STATE_DIR / "tracking"  # Phase 4 - Progress tracking persistence
+TRACKING_DIR = STATE_DIR / "tracking"  # Legacy per-workflow tracking files (migrated into STATE_DB on startup)
+STATE_DB = STATE_DIR / "bot_state.db"  # Progress tracking + summary cache persistence (SQLite WAL)
 DEDUP_DIR = STATE_DIR / "deduplication"  # v5.10.0 - Content deduplication persistence
 PID_FILE = STATE_DIR / "bot.pid"
 PERSISTENCE_FILE = STATE_DIR / "bot_persistence.pickle"  # v5.13.0 - Conversation state persistence
@@ -94,6 +100,14 @@ IDLE_TIMEOUT_SECONDS = int(os.getenv("BOT_IDLE_TIMEOUT", "0"))  # 0 = disabled (
 POLL_INTERVAL = 1.0  # seconds
 POLL_TIMEOUT = 10  # API request timeout
 PROGRESS_POLL_INTERVAL = 2.0  # Progress updates every 2 seconds
+LOG_LEVEL = os.getenv("BOT_LOG_LEVEL", "INFO").upper()  # DEBUG = per-step handler traces + per-tick progress poller diagnostics
+
+# Webhook mode (optional): set TELEGRAM_WEBHOOK_URL to the public HTTPS URL that
+# forwards to WEBHOOK_LISTEN:WEBHOOK_PORT (e.g. via cloudflared); unset = long polling
+WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+WEBHOOK_LISTEN = os.getenv("TELEGRAM_WEBHOOK_LISTEN", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
+WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")  # Verified on every incoming update
 
 if not BOT_TOKEN or not CHAT_ID:
     print("❌ Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID", file=sys.stderr)
@@ -124,7 +138,7 @@ from workflow_utils import (
     load_workflow_registry,
     filter_workflows_by_triggers
 )
-from bot_utils import log_event
+from bot_utils import queue_event, start_event_flusher, start_log_listener, write_json_atomic
 from pid_manager import PIDFileManager
 from message_builders import (
     build_workflow_start_message,
@@ -145,6 +159,9 @@ from file_processors import (
     scan_and_process
 )
 from handlers import (
+    dispatch_to_orchestrator,
+    start_orchestrator_worker,
+    stop_orchestrator_worker,
     handle_view_details,
     handle_workflow_selection
 )
@@ -157,10 +174,14 @@ from handler_classes import (
 from bot_services import (
     periodic_file_scanner,
     progress_poller,
-    idle_timeout_monitor
+    start_idle_timer,
+    stop_idle_timer
 )
 from deduplication_store import DeduplicationStore
-from tracking_cleanup import cleanup_orphaned_tracking
+from chat_rate_limiter import ChatRateLimiter
+from message_batcher import MessageBatcher
+from state_store import open_state_store, close_state_store, prune_state, start_state_writer
+from ulid_gen import generate as generate_ulid
 import bot_state
 from bot_state import (
     update_activity,
@@ -168,12 +189,14 @@ from bot_state import (
     restore_progress_tracking
 )
 
+logger = logging.getLogger("lychee.bot")
+
 
 def signal_handler(signum: int, frame) -> None:
     """Handle termination signals."""
     sig_name = signal.Signals(signum).name
     print(f"\n🛑 Received {sig_name}, shutting down...")
-    bot_state.shutdown_requested = True
+    bot_state.request_shutdown()
 
 
 
@@ -193,9 +216,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()  # Acknowledge immediately
 
-    # Resolve callback to full context
+    # Resolve callback to full context (file stat + read, off the event loop)
     try:
-        ctx = resolve_callback_data(query.data)
+        ctx = await asyncio.to_thread(resolve_callback_data, query.data)
     except ValueError as e:
         await query.edit_message_text(
             text=convert_to_telegram_markdown(f"❌ {e}"),
@@ -219,7 +242,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Phase 3 - v4.0.0: Handle workflow selection actions
     if action.startswith("workflow_") or action == "custom_prompt":
-        await handle_workflow_selection(query, workspace_id, workspace_path, session_id, action, correlation_id, context, SELECTIONS_DIR, TRACKING_DIR)
+        await handle_workflow_selection(query, workspace_id, workspace_path, session_id, action, correlation_id, context, SELECTIONS_DIR)
         update_activity()
         return
 
@@ -241,12 +264,12 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     }
 
     APPROVAL_DIR.mkdir(parents=True, exist_ok=True)
-    approval_file.write_text(json.dumps(approval_state, indent=2))
+    await asyncio.to_thread(write_json_atomic, approval_file, approval_state)
 
     print(f"✅ Approval file written: {approval_file.name}")
 
     # Log approval created event
-    log_event(
+    queue_event(
         correlation_id,
         workspace_hash,
         session_id,
@@ -255,27 +278,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         {"action": action, "approval_file": approval_file.name}
     )
 
-    # Start orchestrator in background to process approval
-    orchestrator_script = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "orchestrator" / "multi-workspace-orchestrator.py"
-    print(f"🚀 Starting orchestrator: {orchestrator_script}")
-
-    try:
-        # Start orchestrator in background (one-shot execution)
-        # Propagate correlation_id via environment for distributed tracing
-        env = os.environ.copy()
-        env["CORRELATION_ID"] = correlation_id
-
-        process = await asyncio.create_subprocess_exec(
-            str(orchestrator_script),
-            str(approval_file),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=env
-        )
-        print(f"   ✓ Orchestrator started (PID: {process.pid})")
-        # Don't wait for completion - orchestrator runs independently
-    except Exception as e:
-        print(f"   ❌ Failed to start orchestrator: {type(e).__name__}: {e}", file=sys.stderr)
+    # Hand approval to the orchestrator worker (processed in background)
+    await dispatch_to_orchestrator(approval_file, correlation_id)
 
     # Confirm to user (with fallback for unregistered workspaces)
     config = get_workspace_config(workspace_id=workspace_id)
@@ -298,20 +302,20 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def _process_pending_files(
     directory: Path,
-    file_pattern: str,
+    prefix: str,
     handler_class: type,
     handler_method: str,
     file_type: str,
     app: Application
 ) -> None:
     """Generic processor for pending files on startup."""
-    await process_pending_files(directory, file_pattern, handler_class, handler_method, file_type, app, int(CHAT_ID))
+    await process_pending_files(directory, prefix, handler_class, handler_method, file_type, app, int(CHAT_ID))
 
 
 async def process_pending_notifications(app: Application) -> None:
     """Process all pending notification files on startup."""
     await _process_pending_files(
-        NOTIFICATION_DIR, "notify_*.json",
+        NOTIFICATION_DIR, "notify_",
         NotificationHandler, "send_notification",
         "notification", app
     )
@@ -320,7 +324,7 @@ async def process_pending_notifications(app: Application) -> None:
 async def process_pending_completions(app: Application) -> None:
     """Process all pending completion files on startup."""
     await _process_pending_files(
-        COMPLETION_DIR, "completion_*.json",
+        COMPLETION_DIR, "completion_",
         CompletionHandler, "send_completion",
         "completion", app
     )
@@ -329,7 +333,7 @@ async def process_pending_completions(app: Application) -> None:
 async def process_pending_executions(app: Application) -> None:
     """Process all pending execution files on startup."""
     await _process_pending_files(
-        EXECUTIONS_DIR, "execution_*.json",
+        EXECUTIONS_DIR, "execution_",
         WorkflowExecutionHandler, "send_execution_completion",
         "execution", app
     )
@@ -339,7 +343,7 @@ async def process_pending_executions(app: Application) -> None:
 
 
 def _restore_progress_tracking() -> None:
-    """Restore progress tracking state from disk (survives watchexec restarts)."""
+    """Restore progress tracking and summary cache from the state store (survives watchexec restarts)."""
     restore_progress_tracking(TRACKING_DIR)
 
 
@@ -359,7 +363,11 @@ async def main() -> int:
     print(f"State TTL: {STATE_TTL_MINUTES} minutes")
     print()
 
-    # Register signal handlers
+    # Configure logging once (records are formatted and written to stderr off the event loop)
+    start_log_listener(LOG_LEVEL)
+
+    # Register signal handlers (they set bot_state.shutdown_event)
+    shutdown_event = bot_state.init_shutdown_event()
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
     print("✅ Signal handlers registered (SIGTERM, SIGINT)")
@@ -373,11 +381,14 @@ async def main() -> int:
         print(f"   Registry path: {WORKFLOWS_REGISTRY}", file=sys.stderr)
         return 1
 
-    # v5.12.0: Cleanup orphaned tracking files (prevent disk bloat)
-    print("\n🧹 Cleaning up orphaned tracking files...")
-    removed_tracking = cleanup_orphaned_tracking(TRACKING_DIR, ttl_minutes=30)
+    # Open state store and drop orphaned tracking state (prevent unbounded growth)
+    print("\n🧹 Cleaning up orphaned tracking state...")
+    open_state_store(STATE_DB)
+    removed_tracking = prune_state(ttl_minutes=30)
     if removed_tracking == 0:
-        print("   ✅ No orphaned tracking files found")
+        print("   ✅ No orphaned tracking state found")
+    else:
+        print(f"   ✅ Removed {removed_tracking} orphaned tracking/summary row(s)")
 
     # Phase 4 - v4.1.0: Restore progress tracking state (survives watchexec restarts)
     _restore_progress_tracking()
@@ -396,13 +407,15 @@ async def main() -> int:
 
     try:
         # Initialize activity tracking
-        bot_state.last_activity_time = asyncio.get_event_loop().time()
+        update_activity()
         print(f"⏱️  Activity timer initialized")
 
-        # Initialize Telegram bot with AIORateLimiter and PicklePersistence
+        # Initialize Telegram bot with rate limiting and PicklePersistence
         print("\n📱 Initializing Telegram bot...")
-        rate_limiter = AIORateLimiter(
-            overall_max_rate=30,    # 30 requests/sec overall (Telegram limit)
+        rate_limiter = ChatRateLimiter(
+            chat_max_rate=1,        # 1 request/sec per private chat (Telegram flood control)
+            chat_time_period=1,     # 1 second window
+            overall_max_rate=25,    # 25 requests/sec overall (headroom under 30/sec limit)
             overall_time_period=1,  # 1 second window
             group_max_rate=20,      # 20 requests/min per group (Telegram limit)
             group_time_period=60,   # 60 second window
@@ -425,15 +438,23 @@ async def main() -> int:
         await app.start()
         print("✅ Telegram bot initialized")
 
+        # Batch event log writes from here on (flushed on shutdown)
+        event_task = start_event_flusher()
+
+        # Tracking/summary persistence off the callback path (flushed on shutdown)
+        state_task = start_state_writer()
+
+        # Coalesce keyboard-less messages (completions, fallbacks) sent in bursts
+        bot_state.message_batcher = MessageBatcher(app.bot)
+        batcher_task = asyncio.create_task(bot_state.message_batcher.run())
+
+        # Start the orchestrator worker now so the first click skips interpreter startup
+        start_orchestrator_worker()
+
         # Log bot started event
-        bot_correlation_id = subprocess.run(
-            [str(Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "lib" / "ulid_gen.py")],
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout.strip()
-
-        log_event(
+        bot_correlation_id = generate_ulid()
+
+        queue_event(
             bot_correlation_id,
             "system",
             f"bot-{os.getpid()}",
@@ -442,42 +463,60 @@ async def main() -> int:
             {"pid": os.getpid(), "idle_timeout_seconds": IDLE_TIMEOUT_SECONDS}
         )
 
-        # Start polling
-        print(f"📡 Starting Telegram API polling (interval: {POLL_INTERVAL}s, timeout: {POLL_TIMEOUT}s)...")
-        await app.updater.start_polling(
-            poll_interval=POLL_INTERVAL,
-            timeout=POLL_TIMEOUT,
-            allowed_updates=["message", "callback_query"]
-        )
-        print("✅ Polling started")
+        # Start update ingress (webhook if configured, else long polling)
+        if WEBHOOK_URL:
+            print(f"🌐 Starting Telegram webhook ({WEBHOOK_LISTEN}:{WEBHOOK_PORT} <- {WEBHOOK_URL})...")
+            await app.updater.start_webhook(
+                listen=WEBHOOK_LISTEN,
+                port=WEBHOOK_PORT,
+                url_path=urlsplit(WEBHOOK_URL).path.lstrip("/"),
+                webhook_url=WEBHOOK_URL,
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=["message", "callback_query"]
+            )
+            print("✅ Webhook started")
+        else:
+            print(f"📡 Starting Telegram API polling (interval: {POLL_INTERVAL}s, timeout: {POLL_TIMEOUT}s)...")
+            await app.updater.start_polling(
+                poll_interval=POLL_INTERVAL,
+                timeout=POLL_TIMEOUT,
+                allowed_updates=["message", "callback_query"]
+            )
+            print("✅ Polling started")
         update_activity()  # Track polling start as activity
 
-        # Process pending files on startup
+        # Process pending files on startup (file types are independent; files
+        # are handled concurrently, so messages may reach Telegram out of order)
         print("\n📂 Processing pending files...")
-        await process_pending_notifications(app)
-        await process_pending_completions(app)
-        await process_pending_executions(app)
+        results = await asyncio.gather(
+            process_pending_notifications(app),
+            process_pending_completions(app),
+            process_pending_executions(app),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"   ❌ Pending file processing failed: {type(result).__name__}: {result}", file=sys.stderr)
         print("✅ Pending files processed")
 
         # Start background tasks
         print()
-        monitor_task = asyncio.create_task(idle_timeout_monitor(IDLE_TIMEOUT_SECONDS))
+        start_idle_timer(IDLE_TIMEOUT_SECONDS)
         scanner_task = asyncio.create_task(periodic_file_scanner(
             app, NOTIFICATION_DIR, COMPLETION_DIR, SUMMARIES_DIR, EXECUTIONS_DIR, int(CHAT_ID)
         ))
         progress_task = asyncio.create_task(progress_poller(app, PROGRESS_DIR, int(CHAT_ID), dedup_store, PROGRESS_POLL_INTERVAL))
 
         # Event loop - wait for shutdown
-        print("\n✅ Bot running (polling for updates + scanning for files + progress updates)")
+        print(f"\n✅ Bot running ({'webhook' if WEBHOOK_URL else 'polling'} for updates + watching files + progress updates)")
         print(f"   Auto-shutdown after {IDLE_TIMEOUT_SECONDS // 60} minutes idle")
         print("   Press Ctrl+C to stop manually")
         print()
 
-        while not bot_state.shutdown_requested:
-            await asyncio.sleep(1)
+        await shutdown_event.wait()
 
-        # Log bot shutdown event
-        log_event(
+        # Log bot shutdown event (flushed with the queue below)
+        queue_event(
             bot_correlation_id,
             "system",
             f"bot-{os.getpid()}",
@@ -488,16 +527,31 @@ async def main() -> int:
 
         # Cleanup
         print("\n🛑 Shutdown initiated")
-        monitor_task.cancel()
+        stop_idle_timer()
         scanner_task.cancel()
         progress_task.cancel()
+        batcher_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await batcher_task
+        bot_state.message_batcher = None
 
-        print("   Stopping polling...")
+        print("   Stopping update ingress...")
         await app.updater.stop()
         print("   Stopping bot...")
         await app.stop()
         print("   Shutting down bot...")
         await app.shutdown()
+        print("   Flushing state writes...")
+        state_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await state_task
+        close_state_store()
+        # Worker drains in-flight workflows after EOF, then exits on its own
+        stop_orchestrator_worker()
+        print("   Flushing queued events...")
+        event_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await event_task
         print("✅ Bot shutdown complete")
 
         return 0
@@ -510,9 +564,7 @@ async def main() -> int:
         print("\n🛑 Interrupted by user (Ctrl+C)")
         return 0
     except Exception as e:
-        print(f"\n❌ Fatal error: {type(e).__name__}: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("❌ Fatal error: %s: %s", type(e).__name__, e)
         return 1
     finally:
         # v5.11.0: PID file auto-cleanup via atexit (no manual cleanup needed)
@@ -5,80 +5,250 @@ Global state shared between bot main file and handler modules.
 """
 
 import asyncio
-import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+import orjson
+
+import state_store
+
+if TYPE_CHECKING:
+    from message_batcher import MessageBatcher
 
 # Global state for bot lifecycle
 shutdown_requested: bool = False
+# Set together with shutdown_requested; lets waiters wake at once instead of polling
+shutdown_event: Optional[asyncio.Event] = None
+_shutdown_loop: Optional[asyncio.AbstractEventLoop] = None
+# Set by the progress poller while it runs; track_progress() sets it so progress
+# files written before tracking was registered are applied right away
+progress_wakeup: Optional[asyncio.Event] = None
+# Idle auto-shutdown deadline and idle progress log (see bot_services.start_idle_timer)
+idle_timer: Optional[asyncio.TimerHandle] = None
+idle_log_timer: Optional[asyncio.TimerHandle] = None
 last_activity_time: Optional[float] = None
 
+# LRU caps (sessions whose workflows never complete would otherwise leak)
+MAX_ACTIVE_PROGRESS_UPDATES = 256
+MAX_SUMMARY_CACHE = 512
+
+
+
+@dataclass(slots=True)
+class TrackingEntry:
+    """
+    Progress tracking for one running workflow (message to edit + display context).
+
+    Slotted: one entry per active workflow is read on every progress update.
+    Persisted as a plain dict (to_dict/from_dict), same shape as the old
+    tracking JSON; fields marked persist=False live in memory only.
+    """
+    message_id: int
+    workspace_id: str
+    session_id: str
+    workflow_id: str
+    workflow_name: str
+    repository_root: str = "unknown"
+    working_directory: str = "."
+    git_branch: str = "unknown"
+    git_modified: int = 0
+    git_untracked: int = 0
+    git_staged: int = 0
+    user_prompt: str = ""  # Preserved for completion message
+    last_response: str = ""  # Preserved for completion message
+    # Rendered invariant part of progress messages (rebuilt after restore)
+    progress_header: Optional[str] = field(default=None, repr=False, metadata={"persist": False})
+    # (status, stage, percent, message) of the last successful edit
+    last_progress: Optional[Tuple[str, str, int, str]] = field(default=None, repr=False, metadata={"persist": False})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Persisted fields as a new dict (safe to hand to the state writer)."""
+        return {name: getattr(self, name) for name in _TRACKING_PERSISTED_FIELDS}
+
+    @classmethod
+    def from_dict(cls, progress_key: tuple, data: Dict[str, Any]) -> "TrackingEntry":
+        """
+        Rebuild from persisted data (unknown keys ignored, missing ones defaulted).
+
+        Raises:
+            TypeError: If message_id is missing
+        """
+        workspace_id, session_id, workflow_id = progress_key
+        values = {name: data[name] for name in _TRACKING_PERSISTED_FIELDS if name in data}
+        values.update(workspace_id=workspace_id, session_id=session_id, workflow_id=workflow_id)
+        values.setdefault("workflow_name", workflow_id)
+        return cls(**values)
+
+
+_TRACKING_PERSISTED_FIELDS = tuple(f.name for f in fields(TrackingEntry) if f.metadata.get("persist", True))
+
 # Phase 4 - v4.1.0: Progress tracking persistence (survives watchexec restarts)
-# Keyed by (workspace_id, session_id, workflow_id) -> tracking data
-active_progress_updates: Dict[tuple, Dict[str, Any]] = {}
+# Keyed by (workspace_id, session_id, workflow_id) -> tracking entry
+active_progress_updates: "OrderedDict[tuple, TrackingEntry]" = OrderedDict()
+# Monotonic registration time per progress key (TTL pruning of abandoned workflows)
+_progress_tracked_at: Dict[tuple, float] = {}
 
 # Phase 3 - v4.0.0: Summary caching for instant workflow menu rendering
 # Keyed by (workspace_id, session_id) -> summary data
-summary_cache: Dict[tuple, Dict[str, Any]] = {}
+summary_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
 
 # Phase 3 - v4.0.0: Workflow registry
 workflow_registry: Optional[Dict[str, Any]] = None
 
+# Coalesces keyboard-less sends (set by main while the flush loop runs)
+message_batcher: Optional["MessageBatcher"] = None
+
+
+def _lru_set(cache: OrderedDict, key: tuple, value: Any, max_entries: int) -> None:
+    """Insert as most recent entry, evicting the oldest beyond max_entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+
+
+def cache_summary(cache_key: tuple, summary_data: Dict[str, Any]) -> None:
+    """Cache summary data for workflow selection (LRU-bounded)."""
+    _lru_set(summary_cache, cache_key, summary_data, MAX_SUMMARY_CACHE)
+
+
+def track_progress(progress_key: tuple, entry: TrackingEntry) -> None:
+    """Register in-memory progress tracking (LRU-bounded)."""
+    _lru_set(active_progress_updates, progress_key, entry, MAX_ACTIVE_PROGRESS_UPDATES)
+    _progress_tracked_at[progress_key] = time.monotonic()
+    if progress_wakeup is not None:
+        progress_wakeup.set()
+
+
+def prune_stale_progress(max_age_seconds: float) -> List[tuple]:
+    """
+    Drop progress tracking registered more than max_age_seconds ago.
+
+    Entries are kept in registration order, so pruning stops at the first
+    fresh one.
+
+    Args:
+        max_age_seconds: Age threshold in seconds
+
+    Returns:
+        Progress keys removed
+    """
+    # Forget timestamps of entries already removed (completion handler, LRU eviction)
+    for key in _progress_tracked_at.keys() - active_progress_updates.keys():
+        del _progress_tracked_at[key]
+
+    cutoff = time.monotonic() - max_age_seconds
+    removed: List[tuple] = []
+    while active_progress_updates:
+        key = next(iter(active_progress_updates))
+        if _progress_tracked_at.get(key, cutoff) > cutoff:
+            break
+        del active_progress_updates[key]
+        _progress_tracked_at.pop(key, None)
+        removed.append(key)
+    return removed
+
+
+def init_shutdown_event() -> asyncio.Event:
+    """
+    Create shutdown_event for the running loop (call once from main).
+
+    Returns:
+        The event (already set if shutdown was requested before this call)
+    """
+    global shutdown_event, _shutdown_loop
+    _shutdown_loop = asyncio.get_running_loop()
+    shutdown_event = asyncio.Event()
+    if shutdown_requested:
+        shutdown_event.set()
+    return shutdown_event
+
+
+def request_shutdown() -> None:
+    """
+    Flag shutdown and wake everything waiting on shutdown_event.
+
+    Safe to call from signal handlers: the event is set via
+    call_soon_threadsafe, which also wakes a loop blocked in select().
+    """
+    global shutdown_requested
+    shutdown_requested = True
+    if shutdown_event is not None and _shutdown_loop is not None:
+        _shutdown_loop.call_soon_threadsafe(shutdown_event.set)
+
 
 def update_activity() -> None:
-    """Update last activity timestamp."""
+    """Update last activity timestamp (monotonic clock, same source as loop.time())."""
     global last_activity_time
-    last_activity_time = asyncio.get_event_loop().time()
+    last_activity_time = time.monotonic()
 
 
 def get_idle_time() -> float:
     """Get seconds since last activity."""
     if last_activity_time is None:
         return 0.0
-    return asyncio.get_event_loop().time() - last_activity_time
+    return time.monotonic() - last_activity_time
 
 
-def restore_progress_tracking(tracking_dir: Path) -> None:
+def _migrate_tracking_files(tracking_dir: Path) -> None:
     """
-    Restore progress tracking state from disk.
-
-    Reads tracking JSON files and populates active_progress_updates dictionary.
-    Survives watchexec restarts.
+    Move tracking JSON files left by older bot versions into the state store.
 
     Args:
-        tracking_dir: Directory containing tracking JSON files
-
-    Raises:
-        json.JSONDecodeError: If tracking file contains invalid JSON (logged, not raised)
-        KeyError: If required fields missing (logged, not raised)
+        tracking_dir: Directory containing legacy *_tracking.json files
     """
-    print("\n🔄 Restoring progress tracking state...")
-
     if not tracking_dir.exists():
-        print(f"   ℹ️  No tracking state to restore")
         return
 
-    restored_count = 0
     for tracking_file in tracking_dir.glob("*_tracking.json"):
         try:
-            tracking_data = json.loads(tracking_file.read_text())
+            tracking_data = orjson.loads(tracking_file.read_bytes())
             # Get IDs from tracking data (more reliable than filename parsing)
             workspace_id = tracking_data["workspace_id"]
             session_id = tracking_data["session_id"]
-            # Extract workflow_id from filename: {workspace}_{session}_{workflow}_tracking.json
-            # UUIDs use dashes (not underscores), so split is simple:
-            # Example: 81e622b5_fb77a731-3922-4da4-bc54-4b2db9de6e40_commit-changes_tracking.json
-            filename_parts = tracking_file.stem.replace("_tracking", "").split("_")
-            # parts[0] = workspace_id (8 chars hash)
-            # parts[1] = session_id (UUID with dashes)
-            # parts[2:] = workflow_id (might contain underscores)
-            workflow_id = "_".join(filename_parts[2:])
-
-            progress_key = (workspace_id, session_id, workflow_id)
-            active_progress_updates[progress_key] = tracking_data
-            restored_count += 1
-            print(f"   ✓ Restored: {workspace_id}/{workflow_id} (msg {tracking_data['message_id']})")
+            workflow_id = tracking_data.get("workflow_id")
+            if workflow_id is None:
+                # Files written before workflow_id was stored:
+                # {workspace}_{session}_{workflow}_tracking.json
+                # (hash and UUID contain no underscores; workflow_id might)
+                workflow_id = tracking_file.stem.removesuffix("_tracking").split("_", 2)[2]
+
+            state_store.save_tracking((workspace_id, session_id, workflow_id), tracking_data)
+            tracking_file.unlink()
+            print(f"   ✓ Migrated: {tracking_file.name}")
         except Exception as e:
-            print(f"   ⚠️  Failed to restore {tracking_file.name}: {e}")
+            print(f"   ⚠️  Failed to migrate {tracking_file.name}: {e}")
+
+
+def restore_progress_tracking(legacy_tracking_dir: Path) -> None:
+    """
+    Restore progress tracking and summary cache from the state store.
+
+    Populates active_progress_updates and summary_cache. Survives watchexec
+    restarts. Legacy tracking JSON files are migrated into the store first.
 
-    print(f"   ✅ Restored {restored_count} tracked workflow(s)")
+    Args:
+        legacy_tracking_dir: Directory of pre-state-store tracking JSON files
+    """
+    print("\n🔄 Restoring progress tracking state...")
+    _migrate_tracking_files(legacy_tracking_dir)
+
+    restored_count = 0
+    for progress_key, tracking_data in state_store.load_tracking():
+        workspace_id, _, workflow_id = progress_key
+        try:
+            entry = TrackingEntry.from_dict(progress_key, tracking_data)
+        except TypeError as e:
+            print(f"   ⚠️  Skipped unusable tracking {workspace_id}/{workflow_id}: {e}")
+            continue
+        track_progress(progress_key, entry)
+        restored_count += 1
+        print(f"   ✓ Restored: {workspace_id}/{workflow_id} (msg {entry.message_id})")
+
+    for cache_key, summary_data in state_store.load_summaries():
+        cache_summary(cache_key, summary_data)
+
+    print(f"   ✅ Restored {restored_count} tracked workflow(s), {len(summary_cache)} cached summaries")
@@ -4,14 +4,37 @@ Bot utility functions for event logging and PID file management.
 Pure utility functions with minimal dependencies.
 """
 
+import asyncio
+import atexit
 import json
+import logging
 import os
+import queue
 import psutil
 import subprocess
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
+import orjson
+
+import event_logger
+from workspace_helpers import PRETTY_STATE_JSON
+
+
+# Resolved once at import (Path.home() re-reads $HOME/pwd on every call)
+EVENT_LOGGER = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "lib" / "event_logger.py"
+
+# Batched event logging (see queue_event / start_event_flusher)
+EVENT_BATCH_SIZE = 32
+EVENT_FLUSH_INTERVAL = 0.05  # seconds to let a burst accumulate
+
+# Set from start_event_flusher() until the flusher task exits
+_event_queue: Optional[asyncio.Queue] = None
+
+logger = logging.getLogger("lychee.bot")
 
 def log_event(
     correlation_id: str,
@@ -35,12 +58,11 @@ def log_event(
     Raises:
         subprocess.CalledProcessError: Event logging failed
     """
-    event_logger = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "lib" / "event_logger.py"
     metadata_json = json.dumps(metadata) if metadata else "{}"
 
     try:
         subprocess.run(
-            [str(event_logger), correlation_id, workspace_id, session_id, component, event_type, metadata_json],
+            [str(EVENT_LOGGER), correlation_id, workspace_id, session_id, component, event_type, metadata_json],
             check=True,
             capture_output=True,
             text=True
@@ -50,6 +72,163 @@ def log_event(
         raise
 
 
+def queue_event(
+    correlation_id: str,
+    workspace_id: str,
+    session_id: str,
+    component: str,
+    event_type: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Queue event for batched in-process logging by the event flusher.
+
+    Falls back to synchronous log_event() when the flusher isn't running
+    (before startup, after shutdown, or after a failed flush).
+
+    Args:
+        correlation_id: ULID for request tracing
+        workspace_id: Workspace hash or ULID
+        session_id: Claude Code session UUID
+        component: Component name (bot)
+        event_type: Event type (e.g., summary.received)
+        metadata: Event-specific data
+    """
+    if _event_queue is None:
+        log_event(correlation_id, workspace_id, session_id, component, event_type, metadata)
+        return
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+    _event_queue.put_nowait(
+        (correlation_id, workspace_id, session_id, component, event_type, metadata, timestamp)
+    )
+
+
+def _write_events(batch: List[event_logger.EventRecord]) -> None:
+    """
+    Write one batch of queued events (one SQLite transaction).
+
+    Failures are logged, not raised: the flusher keeps running. One invalid
+    record (e.g. missing correlation ID) rejects the whole transaction, so a
+    failed batch is retried record by record and only the bad ones dropped.
+    """
+    try:
+        event_logger.log_events(batch)
+    except event_logger.DatabaseConnectionError as e:
+        # Nothing in this batch can be written; retrying per record won't help
+        logger.error("❌ Failed to log %d event(s): %s", len(batch), e)
+    except (event_logger.EventLoggingError, TypeError, ValueError) as e:
+        if len(batch) == 1:
+            logger.error("❌ Dropped event %s: %s: %s", batch[0][4], type(e).__name__, e)
+            return
+        logger.warning("⚠️  Event batch of %d failed (%s), retrying per event", len(batch), e)
+        for record in batch:
+            _write_events([record])
+
+
+def start_event_flusher() -> asyncio.Task:
+    """
+    Start batched event logging.
+
+    The queue is installed before returning, so queue_event() calls made
+    right after this (before the task first runs) are batched too.
+
+    Returns:
+        Flusher task (cancel and await it to flush pending events)
+    """
+    global _event_queue
+    _event_queue = asyncio.Queue()
+    return asyncio.create_task(run_event_flusher(_event_queue))
+
+
+async def run_event_flusher(queue: asyncio.Queue) -> None:
+    """
+    Drain queued events into the SQLite event store in batches.
+
+    After the first event arrives, waits EVENT_FLUSH_INTERVAL so bursts
+    coalesce into a single transaction of up to EVENT_BATCH_SIZE events,
+    committed off the event loop. Pending events are flushed when the task
+    is cancelled.
+
+    Args:
+        queue: Event queue installed by start_event_flusher()
+    """
+    global _event_queue
+    batch: List[event_logger.EventRecord] = []
+    try:
+        while True:
+            batch.append(await queue.get())
+            await asyncio.sleep(EVENT_FLUSH_INTERVAL)
+            while len(batch) < EVENT_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            # Hand the batch off before awaiting: if cancelled mid-write, the
+            # thread finishes it and the flush below must not write it again
+            to_write, batch = batch, []
+            await asyncio.to_thread(_write_events, to_write)
+    finally:
+        _event_queue = None
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            _write_events(batch)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message/traceback formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def start_log_listener(level: str) -> QueueListener:
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Handlers only enqueue the record; formatting (including logger.exception
+    tracebacks) and the stdout/stderr writes happen off the event loop.
+    Records below WARNING go to stdout, the rest to stderr. The listener is
+    stopped at exit so queued records are flushed.
+
+    Args:
+        level: Root logger level name (e.g. "INFO")
+
+    Returns:
+        The started QueueListener
+    """
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(formatter)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(formatter)
+    stderr_handler.setLevel(logging.WARNING)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stdout_handler, stderr_handler, respect_handler_level=True)
+    logging.basicConfig(level=level, handlers=[_DeferredQueueHandler(log_queue)])
+    # httpx logs every Bot API request (including each long poll) at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write state file via temp file + os.replace.
+
+    Pollers and the orchestrator never observe a truncated or half-written
+    file; the .tmp sibling doesn't match their *.json scans.
+
+    Args:
+        path: Destination JSON file
+        data: JSON-serializable state
+    """
+    temp_file = path.with_suffix(".tmp")
+    temp_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY_STATE_JSON else 0))
+    os.replace(temp_file, path)
+
+
 def is_bot_running(pid: int, script_name: str = "multi-workspace-bot.py") -> Tuple[bool, Optional[str]]:
     """
     Check if bot process is actually running using psutil (industry-standard approach).
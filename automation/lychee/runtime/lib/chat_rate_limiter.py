@@ -0,0 +1,69 @@
+"""
+Per-chat Telegram rate limiting.
+
+AIORateLimiter only applies per-chat limits to groups/channels (negative
+chat IDs). The bot talks to a private chat, so bursts (startup backlog,
+several workflows finishing together) were bounded only by the global
+budget and could trip Telegram's ~1 msg/sec per-chat flood control.
+"""
+
+import contextlib
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+from aiolimiter import AsyncLimiter
+from telegram.ext import AIORateLimiter
+
+
+class ChatRateLimiter(AIORateLimiter):
+    """
+    AIORateLimiter with an additional token bucket per private chat.
+
+    Requests carrying a positive chat_id pass through that chat's limiter
+    before the inherited global/group limits and RetryAfter handling.
+    """
+
+    def __init__(
+        self,
+        chat_max_rate: float = 1,
+        chat_time_period: float = 1,
+        **kwargs: Any
+    ):
+        """
+        Args:
+            chat_max_rate: Requests allowed per chat_time_period for one private chat
+            chat_time_period: Window in seconds for chat_max_rate
+            **kwargs: Passed to AIORateLimiter (overall/group limits, max_retries)
+        """
+        super().__init__(**kwargs)
+        self._chat_max_rate = chat_max_rate
+        self._chat_time_period = chat_time_period
+        self._chat_limiters: Dict[int, AsyncLimiter] = {}
+
+    def _get_chat_limiter(self, chat_id: Any) -> Optional[AsyncLimiter]:
+        """Return the limiter for a private chat, or None for groups/channels/no chat."""
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+        if not isinstance(chat_id, int) or chat_id <= 0:
+            return None
+
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = self._chat_limiters[chat_id] = AsyncLimiter(
+                max_rate=self._chat_max_rate,
+                time_period=self._chat_time_period
+            )
+        return limiter
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int]
+    ) -> Any:
+        """Apply the per-chat bucket, then the inherited limits."""
+        limiter = self._get_chat_limiter(data.get("chat_id"))
+        async with limiter if limiter is not None else contextlib.nullcontext():
+            return await super().process_request(callback, args, kwargs, endpoint, data, rate_limit_args)
@@ -13,11 +13,14 @@ Solution: Persist SHA256 hashes to disk with TTL-based cleanup.
 """
 
 import hashlib
+import logging
 import sys
 import time
 from pathlib import Path
 from typing import Dict, Tuple
 
+logger = logging.getLogger("lychee.bot")
+
 
 class DeduplicationStore:
     """
@@ -41,6 +44,8 @@ class DeduplicationStore:
         self.dedup_dir = dedup_dir
         self.ttl_seconds = ttl_minutes * 60
         self.cache: Dict[Tuple[str, str, str], str] = {}
+        # Digest of content check_duplicate found new, reused by record_sent when sent
+        self._pending: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
 
         # Ensure directory exists
         try:
@@ -79,10 +84,17 @@ class DeduplicationStore:
         content_hash = hashlib.sha256(content.encode()).hexdigest()
 
         # Check in-memory cache first (fast path)
-        if progress_key in self.cache:
-            if self.cache[progress_key] == content_hash:
+        cached_hash = self.cache.get(progress_key)
+        if cached_hash is not None:
+            if cached_hash == content_hash:
+                # Nothing will be sent: drop text left over from an earlier failed send
+                self._pending.pop(progress_key, None)
                 print(f"   ⏭️  Dedup: Cache HIT (in-memory) - skipping API call")
                 return True
+            # Memory is authoritative once populated (disk mirrors it) - skip disk lookup
+            logger.debug("   ✅ Dedup: Cache MISS - sending to Telegram")
+            self._pending[progress_key] = (content, content_hash)
+            return False
 
         # Check disk cache (restore after restart)
         hash_file = self._make_filename(workspace_id, session_id, workflow_id)
@@ -95,6 +107,7 @@ class DeduplicationStore:
                     if stored_hash == content_hash:
                         # Restore to memory for fast future lookups
                         self.cache[progress_key] = content_hash
+                        self._pending.pop(progress_key, None)
                         print(f"   ⏭️  Dedup: Cache HIT (disk) - skipping API call")
                         return True
                 else:
@@ -107,6 +120,7 @@ class DeduplicationStore:
 
         # Not a duplicate
         print(f"   ✅ Dedup: Cache MISS - sending to Telegram")
+        self._pending[progress_key] = (content, content_hash)
         return False
 
     def record_sent(self, workspace_id: str, session_id: str, workflow_id: str, content: str) -> None:
@@ -123,7 +137,11 @@ class DeduplicationStore:
             OSError: If hash file write fails (critical error)
         """
         progress_key = (workspace_id, session_id, workflow_id)
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        pending = self._pending.pop(progress_key, None)
+        if pending is not None and pending[0] is content:
+            content_hash = pending[1]  # Same object checked just before sending
+        else:
+            content_hash = hashlib.sha256(content.encode()).hexdigest()
 
         # Update in-memory cache
         self.cache[progress_key] = content_hash
@@ -153,6 +171,7 @@ class DeduplicationStore:
 
         # Remove from memory
         self.cache.pop(progress_key, None)
+        self._pending.pop(progress_key, None)
 
         # Remove from disk
         hash_file = self._make_filename(workspace_id, session_id, workflow_id)
@@ -21,7 +21,7 @@ import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 
 # Database path from environment or default
@@ -29,6 +29,19 @@ DEFAULT_DB_PATH = Path.home() / ".claude" / "automation" / "lychee" / "state" /
 DB_PATH = Path(os.getenv("LYCHEE_EVENTS_DB", str(DEFAULT_DB_PATH)))
 
 
+# Valid component names
+VALID_COMPONENTS = {'hook', 'bot', 'orchestrator', 'claude-cli'}
+
+INSERT_EVENT_SQL = """
+    INSERT INTO session_events
+    (correlation_id, workspace_id, session_id, component, event_type, timestamp, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# (correlation_id, workspace_id, session_id, component, event_type, metadata, timestamp)
+EventRecord = Tuple[str, str, str, str, str, Optional[Dict[str, Any]], str]
+
+
 class EventLoggingError(Exception):
     """Base exception for event logging failures."""
     pass
@@ -68,22 +81,45 @@ def log_event(
         CorrelationIDMissing: correlation_id is empty
         EventLoggingError: Any other database error
     """
-    # Validate required fields
-    if not correlation_id:
-        raise CorrelationIDMissing("correlation_id is required")
-
-    # Validate component
-    valid_components = {'hook', 'bot', 'orchestrator', 'claude-cli'}
-    if component not in valid_components:
-        raise EventLoggingError(
-            f"Invalid component '{component}', must be one of {valid_components}"
-        )
-
     # Current timestamp
     timestamp = datetime.now(timezone.utc).isoformat()
+    log_events([(correlation_id, workspace_id, session_id, component, event_type, metadata, timestamp)])
 
-    # Encode metadata as JSON
-    metadata_json = json.dumps(metadata) if metadata else None
+
+def log_events(events: Iterable[EventRecord]) -> int:
+    """
+    Log a batch of events to SQLite event store in one transaction.
+
+    Args:
+        events: EventRecord tuples; timestamp is captured by the caller
+            when the event happened, not when it is written
+
+    Returns:
+        Number of events written
+
+    Raises:
+        DatabaseConnectionError: Cannot connect to database
+        CorrelationIDMissing: correlation_id is empty
+        EventLoggingError: Any other database error (no events written)
+    """
+    rows = []
+    for correlation_id, workspace_id, session_id, component, event_type, metadata, timestamp in events:
+        # Validate required fields
+        if not correlation_id:
+            raise CorrelationIDMissing("correlation_id is required")
+
+        # Validate component
+        if component not in VALID_COMPONENTS:
+            raise EventLoggingError(
+                f"Invalid component '{component}', must be one of {VALID_COMPONENTS}"
+            )
+
+        # Encode metadata as JSON
+        metadata_json = json.dumps(metadata) if metadata else None
+        rows.append((correlation_id, workspace_id, session_id, component, event_type, timestamp, metadata_json))
+
+    if not rows:
+        return 0
 
     # Connect to database
     try:
@@ -92,21 +128,16 @@ def log_event(
         raise DatabaseConnectionError(f"Cannot connect to {DB_PATH}: {e}") from e
 
     try:
-        # Insert event
-        conn.execute(
-            """
-            INSERT INTO session_events
-            (correlation_id, workspace_id, session_id, component, event_type, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (correlation_id, workspace_id, session_id, component, event_type, timestamp, metadata_json)
-        )
-        conn.commit()
+        # Insert events (single commit for the whole batch)
+        with conn:
+            conn.executemany(INSERT_EVENT_SQL, rows)
     except sqlite3.Error as e:
-        raise EventLoggingError(f"Failed to insert event: {e}") from e
+        raise EventLoggingError(f"Failed to insert events: {e}") from e
     finally:
         conn.close()
 
+    return len(rows)
+
 
 def main() -> int:
     """
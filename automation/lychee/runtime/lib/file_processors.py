@@ -4,16 +4,24 @@ File processing utilities for Telegram bot.
 Generic file scanning and processing functions for startup and periodic scans.
 """
 
-import sys
+import asyncio
+import logging
+import os
 from pathlib import Path
-from typing import Type
+from typing import Dict, List, Optional, Tuple, Type
 
 from telegram.ext import Application
 
+logger = logging.getLogger("lychee.bot")
+
+# State files handled concurrently across all dispatchers (I/O bound; the
+# bot's rate limiter still paces the Telegram requests themselves)
+MAX_CONCURRENT_FILES = 8
+_file_slots = asyncio.Semaphore(MAX_CONCURRENT_FILES)
 
 async def process_pending_files(
     directory: Path,
-    file_pattern: str,
+    prefix: str,
     handler_class: Type,
     handler_method: str,
     file_type: str,
@@ -23,11 +31,11 @@ async def process_pending_files(
     """
     Process pending files on startup.
 
-    Scans directory for files matching pattern and processes with handler.
+    Scans directory for "{prefix}*.json" files and processes with handler.
 
     Args:
         directory: Directory to scan
-        file_pattern: Glob pattern (e.g., "notify_*.json")
+        prefix: Filename prefix (e.g., "notify_")
         handler_class: Handler class to instantiate
         handler_method: Method name to call on handler
         file_type: Human-readable file type for logging
@@ -40,31 +48,91 @@ async def process_pending_files(
     handler = handler_class(app.bot, chat_id)
 
     # Check if directory exists
-    if not directory.exists():
-        print(f"📂 No {file_type} directory found")
+    if not directory.is_dir():
+        logger.info("📂 No %s directory found", file_type)
         return
 
     # Scan for files
-    files = sorted(directory.glob(file_pattern))
+    files = scan_json_files(directory, prefix)
     if not files:
-        print(f"📂 No pending {file_type}s")
+        logger.info("📂 No pending %ss", file_type)
         return
 
-    print(f"📬 Found {len(files)} pending {file_type}(s)")
-    for file in files:
-        try:
-            print(f"   Processing: {file.name}")
-            # Call handler method dynamically
-            await getattr(handler, handler_method)(file)
-        except Exception as e:
-            print(f"   ❌ Failed to process {file.name}: {type(e).__name__}: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
+    logger.info("📬 Found %s pending %s(s)", len(files), file_type)
+    await process_files(files, handler, handler_method, file_type)
+
+
+def scan_json_files(directory: Path, prefix: str = "") -> List[Path]:
+    """
+    List "{prefix}*.json" files in directory with a single os.scandir pass.
+
+    DirEntry carries the name and file type from the directory read, so no
+    per-entry stat and no separate exists() check are needed.
+
+    Args:
+        directory: Directory to scan
+        prefix: Required filename prefix (e.g., "notify_")
+
+    Returns:
+        Sorted list of matching paths (empty if directory missing)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith(".json") and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    names.sort()
+    return [directory / name for name in names]
+
+
+def list_pending_files(
+    directory: Path,
+    prefix: str,
+    empty_listings: Optional[Dict[Tuple[Path, str], int]] = None
+) -> List[Path]:
+    """
+    List pending "{prefix}*.json" files in directory (blocking).
+
+    Kept synchronous so callers can run several listings concurrently
+    via asyncio.to_thread.
+
+    Args:
+        directory: Directory to scan
+        prefix: Filename prefix (e.g., "summary_")
+        empty_listings: (directory, prefix) -> directory st_mtime_ns when the
+            last listing came back empty. If the directory mtime is unchanged
+            the readdir is skipped (one stat). Non-empty results are never
+            cached so unconsumed files are retried.
+
+    Returns:
+        Sorted list of matching paths (empty if directory missing)
+    """
+    if empty_listings is None:
+        return scan_json_files(directory, prefix)
+
+    # stat before listing: a file created after this point changes the mtime
+    key = (directory, prefix)
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if empty_listings.get(key) == mtime_ns:
+        return []
+
+    files = scan_json_files(directory, prefix)
+    if files:
+        empty_listings.pop(key, None)
+    else:
+        empty_listings[key] = mtime_ns
+    return files
 
 
 async def scan_and_process(
     directory: Path,
-    file_pattern: str,
+    prefix: str,
     handler,
     handler_method: str,
     file_type: str
@@ -76,7 +144,7 @@ async def scan_and_process(
 
     Args:
         directory: Directory to scan
-        file_pattern: Glob pattern for files
+        prefix: Filename prefix (e.g., "summary_")
         handler: Handler instance (already instantiated)
         handler_method: Method name to call
         file_type: File type name for logging
@@ -84,13 +152,46 @@ async def scan_and_process(
     Raises:
         Exceptions from handler methods propagate (logged but not raised)
     """
-    if not directory.exists():
-        return
+    files = await asyncio.to_thread(list_pending_files, directory, prefix)
+    await process_files(files, handler, handler_method, file_type)
+
 
-    files = sorted(directory.glob(file_pattern))
-    for file in files:
+async def process_files(
+    files: List[Path],
+    handler,
+    handler_method: str,
+    file_type: str
+) -> None:
+    """
+    Process already-listed files with handler, up to MAX_CONCURRENT_FILES at once.
+
+    Files are started in list order; reading, parsing and formatting overlap
+    while sends queue on the rate limiter, so sends may complete out of order.
+
+    Args:
+        files: Files to process
+        handler: Handler instance (already instantiated)
+        handler_method: Method name to call
+        file_type: File type name for logging
+
+    Raises:
+        Exceptions from handler methods propagate (logged but not raised)
+    """
+    await asyncio.gather(*(
+        _process_file(file, handler, handler_method, file_type) for file in files
+    ))
+
+
+async def _process_file(
+    file: Path,
+    handler,
+    handler_method: str,
+    file_type: str
+) -> None:
+    """Process one file with handler (errors logged, not raised)."""
+    async with _file_slots:
         try:
-            print(f"📬 Found {file_type}: {file.name}")
+            logger.info("📬 Found %s: %s", file_type, file.name)
             await getattr(handler, handler_method)(file)
         except Exception as e:
-            print(f"❌ Failed to process {file.name}: {type(e).__name__}: {e}", file=sys.stderr)
+            logger.error("❌ Failed to process %s: %s: %s", file.name, type(e).__name__, e)
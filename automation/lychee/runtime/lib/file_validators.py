@@ -5,14 +5,33 @@ Validates required fields in notification, completion, execution, and summary fi
 Raises ValueError on missing fields or JSON parse errors.
 """
 
-import json
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet
+
+import orjson
+
+# Required fields per state file type (set difference against dict keys)
+NOTIFICATION_REQUIRED_FIELDS = frozenset({
+    "workspace_path", "session_id", "error_count", "details", "timestamp"
+})
+COMPLETION_REQUIRED_FIELDS = frozenset({
+    "workspace_id", "session_id", "status", "exit_code",
+    "duration_seconds", "summary", "timestamp"
+})
+EXECUTION_REQUIRED_FIELDS = frozenset({
+    "correlation_id", "workspace_id", "session_id", "workflow_id",
+    "workflow_name", "status", "exit_code", "duration_seconds", "timestamp"
+})
+SUMMARY_REQUIRED_FIELDS = frozenset({
+    "correlation_id", "workspace_path", "workspace_id", "session_id",
+    "timestamp", "duration_seconds", "git_status", "lychee_status"
+})
 
 
 def validate_json_file(
     file_path: Path,
-    required_fields: List[str],
+    required_fields: FrozenSet[str],
     file_type: str = "file"
 ) -> Dict[str, Any]:
     """
@@ -20,7 +39,7 @@ def validate_json_file(
 
     Args:
         file_path: Path to JSON file
-        required_fields: List of required field names
+        required_fields: Required field names
         file_type: Human-readable file type for error messages
 
     Returns:
@@ -28,19 +47,20 @@ def validate_json_file(
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        json.JSONDecodeError: If file isn't valid JSON
+        orjson.JSONDecodeError: If file isn't valid JSON (subclass of json.JSONDecodeError)
         ValueError: If required fields are missing
     """
-    if not file_path.exists():
-        raise FileNotFoundError(f"{file_type} not found: {file_path}")
+    try:
+        content = file_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{file_type} not found: {file_path}") from None
 
-    with file_path.open() as f:
-        data = json.load(f)
+    data = orjson.loads(content)
 
     # Validate required fields
-    missing = [f for f in required_fields if f not in data]
+    missing = required_fields - data.keys()
     if missing:
-        raise ValueError(f"Missing required fields in {file_type}: {missing}")
+        raise ValueError(f"Missing required fields in {file_type}: {sorted(missing)}")
 
     return data
 
@@ -57,10 +77,9 @@ def validate_notification_file(notification_file: Path) -> Dict[str, Any]:
 
     Raises:
         ValueError: If required fields missing
-        json.JSONDecodeError: If invalid JSON
+        orjson.JSONDecodeError: If invalid JSON
     """
-    required = ["workspace_path", "session_id", "error_count", "details", "timestamp"]
-    return validate_json_file(notification_file, required, "notification")
+    return validate_json_file(notification_file, NOTIFICATION_REQUIRED_FIELDS, "notification")
 
 
 def validate_completion_file(completion_file: Path) -> Dict[str, Any]:
@@ -75,11 +94,9 @@ def validate_completion_file(completion_file: Path) -> Dict[str, Any]:
 
     Raises:
         ValueError: If required fields missing
-        json.JSONDecodeError: If invalid JSON
+        orjson.JSONDecodeError: If invalid JSON
     """
-    required = ["workspace_id", "session_id", "status", "exit_code",
-                "duration_seconds", "summary", "timestamp"]
-    return validate_json_file(completion_file, required, "completion")
+    return validate_json_file(completion_file, COMPLETION_REQUIRED_FIELDS, "completion")
 
 
 def validate_execution_file(execution_file: Path) -> Dict[str, Any]:
@@ -94,11 +111,9 @@ def validate_execution_file(execution_file: Path) -> Dict[str, Any]:
 
     Raises:
         ValueError: If required fields missing
-        json.JSONDecodeError: If invalid JSON
+        orjson.JSONDecodeError: If invalid JSON
     """
-    required = ["correlation_id", "workspace_id", "session_id", "workflow_id",
-                "workflow_name", "status", "exit_code", "duration_seconds", "timestamp"]
-    return validate_json_file(execution_file, required, "execution")
+    return validate_json_file(execution_file, EXECUTION_REQUIRED_FIELDS, "execution")
 
 
 def validate_summary_file(summary_file: Path) -> Dict[str, Any]:
@@ -113,26 +128,27 @@ def validate_summary_file(summary_file: Path) -> Dict[str, Any]:
 
     Raises:
         ValueError: If required fields missing
-        json.JSONDecodeError: If invalid JSON with detailed error reporting
+        orjson.JSONDecodeError: If invalid JSON with detailed error reporting
+            (subclass of json.JSONDecodeError)
     """
+    content = summary_file.read_bytes()
     try:
-        with summary_file.open() as f:
-            content = f.read()
-            data = json.loads(content)
-    except json.JSONDecodeError as e:
-        # Provide detailed error context for debugging
-        print(f"❌ JSON PARSE ERROR in {summary_file.name}:")
-        print(f"   Error: {e}")
-        print(f"   File content:")
-        for i, line in enumerate(content.split('\n'), 1):
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        # Provide detailed error context for debugging (one buffered write)
+        report = [
+            f"❌ JSON PARSE ERROR in {summary_file.name}:\n",
+            f"   Error: {e}\n",
+            "   File content:\n"
+        ]
+        for i, line in enumerate(content.decode(errors="replace").split('\n'), 1):
             marker = " <-- ERROR" if i == e.lineno else ""
-            print(f"   {i:3d}: {line}{marker}")
+            report.append(f"   {i:3d}: {line}{marker}\n")
+        sys.stdout.write("".join(report))
         raise
 
-    required = ["correlation_id", "workspace_path", "workspace_id", "session_id",
-                "timestamp", "duration_seconds", "git_status", "lychee_status"]
-    missing = [f for f in required if f not in data]
+    missing = SUMMARY_REQUIRED_FIELDS - data.keys()
     if missing:
-        raise ValueError(f"Missing required fields in summary: {missing}")
+        raise ValueError(f"Missing required fields in summary: {sorted(missing)}")
 
     return data
@@ -4,8 +4,9 @@ Formatting utilities for Telegram bot messages.
 Pure utility functions with no external dependencies (except workspace_helpers).
 """
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import json
 
 # Import workspace helpers for config loading
@@ -13,11 +14,26 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent))
 from workspace_helpers import get_workspace_id_from_path, load_registry
 
+# Home directory string, resolved once (used for ~ display collapsing)
+_HOME_STR = str(Path.home())
 
+# get_workspace_config results for the registry object load_registry() currently
+# returns (a reload yields a new object, which drops every entry)
+_workspace_config_cache: Dict[str, Any] = {"registry": None, "entries": {}}
+
+# Markdown escape table for str.translate (single C-level pass per string)
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({'_': '\\_', '*': '\\*', '`': '\\`'})
+# Same table, also flattening newlines to spaces for single-line display
+_MARKDOWN_ESCAPE_SINGLE_LINE_TABLE = str.maketrans({'_': '\\_', '*': '\\*', '`': '\\`', '\n': ' '})
+
+
+@lru_cache(maxsize=1024)
 def format_git_status_compact(modified: int, staged: int, untracked: int) -> str:
     """
     Format compact git status line.
 
+    Cached: counts are small and the same triples recur across messages.
+
     Args:
         modified: Count of modified files
         staged: Count of staged files
@@ -29,17 +45,72 @@ def format_git_status_compact(modified: int, staged: int, untracked: int) -> str
     return f"M:{modified} S:{staged} U:{untracked}"
 
 
+def format_git_porcelain_display(porcelain_lines: List[str], max_lines: int = 10) -> str:
+    """
+    Format git porcelain lines as a fenced code block.
+
+    Args:
+        porcelain_lines: Lines from `git status --porcelain`
+        max_lines: Maximum lines shown before "... and N more"
+
+    Returns:
+        Code block prefixed with newline, or empty string if no lines
+    """
+    if not porcelain_lines:
+        return ""
+    # Wrap in code block for proper formatting (prevents markdown parsing issues);
+    # fences, lines and overflow marker joined in one pass
+    parts = ["\n```", *porcelain_lines[:max_lines]]
+    extra = len(porcelain_lines) - max_lines
+    if extra > 0:
+        parts.append(f"... and {extra} more")
+    parts.append("```")
+    return "\n".join(parts)
+
+
+@lru_cache(maxsize=512)
 def format_repo_display(path: str) -> str:
     """
     Format repository path with home directory as tilde.
 
+    Memoized: the poller formats the same repository root on every update.
+
     Args:
         path: Absolute path to repository
 
     Returns:
-        Path with home directory replaced by ~
+        Path with leading home directory replaced by ~
+    """
+    path = str(path)
+    if path.startswith(_HOME_STR):
+        return "~" + path[len(_HOME_STR):]
+    return path
+
+
+def first_nonempty_line(text: str) -> str:
     """
-    return str(path).replace(str(Path.home()), "~")
+    Return the first non-blank line of text, stripped.
+
+    Scans line by line with str.find instead of splitting the whole text,
+    so large process outputs are not copied just to read their first line.
+
+    Args:
+        text: Multi-line text (e.g., captured stdout)
+
+    Returns:
+        First non-blank line, or "" if there is none
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            end = length
+        line = text[start:end].strip()
+        if line:
+            return line
+        start = end + 1
+    return ""
 
 
 def escape_markdown(text: str) -> str:
@@ -59,7 +130,20 @@ def escape_markdown(text: str) -> str:
         in Telegram Markdown when used in link syntax [text](url). Standalone
         brackets should be displayed as-is.
     """
-    return text.replace('_', '\\_').replace('*', '\\*').replace('`', '\\`')
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
+
+
+def escape_markdown_single_line(text: str) -> str:
+    """
+    Escape markdown characters and replace newlines with spaces in one pass.
+
+    Args:
+        text: Text to escape
+
+    Returns:
+        Escaped single-line text (same escaping rules as escape_markdown)
+    """
+    return text.translate(_MARKDOWN_ESCAPE_SINGLE_LINE_TABLE)
 
 
 def escape_html(text: str) -> str:
@@ -364,6 +448,9 @@ def get_workspace_config(
     """
     Load workspace configuration with fallback for unregistered workspaces.
 
+    Memoized until registry.json changes (path resolution and registry scan
+    run once per workspace); callers must treat the result as read-only.
+
     Args:
         workspace_id: Workspace identifier (registry name or hash)
         workspace_path: Workspace path (used to derive ID if workspace_id not provided)
@@ -376,6 +463,32 @@ def get_workspace_config(
     Raises:
         ValueError: If neither workspace_id nor workspace_path provided
     """
+    try:
+        registry = load_registry()
+    except (ValueError, FileNotFoundError):
+        registry = None  # Every lookup falls back to defaults until a registry exists
+
+    if _workspace_config_cache["registry"] is not registry:
+        _workspace_config_cache["registry"] = registry
+        _workspace_config_cache["entries"] = {}
+
+    entries: Dict[Tuple[Optional[str], Optional[Path], bool], Dict[str, str]] = _workspace_config_cache["entries"]
+    key = (workspace_id, workspace_path, include_name)
+    config = entries.get(key)
+    if config is None:
+        config = entries[key] = _load_workspace_config(workspace_id, workspace_path, include_name, verbose)
+    elif verbose:
+        print(f"   ✓ Workspace config (cached): emoji={config['emoji']}")
+    return config
+
+
+def _load_workspace_config(
+    workspace_id: Optional[str],
+    workspace_path: Optional[Path],
+    include_name: bool,
+    verbose: bool
+) -> Dict[str, str]:
+    """Resolve workspace config from the registry (uncached; see get_workspace_config)."""
     if verbose:
         print(f"   📋 Loading workspace registry...")
 
@@ -4,12 +4,13 @@ Telegram inline keyboard builders for bot workflows.
 Constructs interactive button layouts for workflow selection and actions.
 """
 
+from itertools import zip_longest
 from pathlib import Path
 from typing import Dict, Any, List
 
 from telegram import InlineKeyboardButton
 
-from workspace_helpers import create_callback_data
+from workspace_helpers import create_callback_data_batch
 
 
 def build_workflow_keyboard(
@@ -32,38 +33,35 @@ def build_workflow_keyboard(
     Returns:
         Telegram keyboard layout (list of button rows)
     """
+    # One context (resolve, timestamp, mkdir) for all buttons
+    callback_ids = create_callback_data_batch(
+        workspace_id=workspace_id,
+        workspace_path=str(workspace_path),
+        session_id=session_id,
+        actions=[f"workflow_{workflow['id']}" for workflow in workflows] + ["custom_prompt"],
+        correlation_id=correlation_id
+    )
+
+    def workflow_button(workflow: Dict[str, Any]) -> InlineKeyboardButton:
+        return InlineKeyboardButton(
+            f"{workflow['icon']} {workflow['name']}",
+            callback_data=callback_ids[f"workflow_{workflow['id']}"]
+        )
+
     keyboard = []
 
-    # Add workflow buttons (2 per row for compact layout)
-    for i in range(0, len(workflows), 2):
-        row = []
-        for workflow in workflows[i:i+2]:
-            row.append(
-                InlineKeyboardButton(
-                    f"{workflow['icon']} {workflow['name']}",
-                    callback_data=create_callback_data(
-                        workspace_id=workspace_id,
-                        workspace_path=str(workspace_path),
-                        session_id=session_id,
-                        action=f"workflow_{workflow['id']}",
-                        correlation_id=correlation_id
-                    )
-                )
-            )
-        keyboard.append(row)
+    # Add workflow buttons (2 per row for compact layout), pairing from one
+    # iterator instead of slicing a new list per row
+    it = iter(workflows)
+    for first, second in zip_longest(it, it):
+        if second is None:
+            keyboard.append([workflow_button(first)])
+        else:
+            keyboard.append([workflow_button(first), workflow_button(second)])
 
     # Add custom prompt option (always available)
     keyboard.append([
-        InlineKeyboardButton(
-            "✏️ Custom Prompt",
-            callback_data=create_callback_data(
-                workspace_id=workspace_id,
-                workspace_path=str(workspace_path),
-                session_id=session_id,
-                action="custom_prompt",
-                correlation_id=correlation_id
-            )
-        )
+        InlineKeyboardButton("✏️ Custom Prompt", callback_data=callback_ids["custom_prompt"])
     ])
 
     return keyboard
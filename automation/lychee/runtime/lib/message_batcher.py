@@ -0,0 +1,151 @@
+"""
+Coalescing of plain Telegram messages sent to the same chat.
+
+A burst of completion files (startup backlog, several workflows finishing
+together) would otherwise cost one send_message - and one per-chat rate
+limit token - per file. Messages queued within a short window are joined
+into as few sends as Telegram's 4096-char limit allows.
+
+Messages with inline keyboards are not batched (one keyboard per message).
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from telegram.error import BadRequest
+
+if TYPE_CHECKING:
+    from telegram import Bot
+
+TELEGRAM_MAX_CHARS = 4096
+
+# (chat_id, parse_mode, text, future resolved once the containing send finishes)
+_QueuedMessage = Tuple[int, Optional[str], str, asyncio.Future]
+
+
+class MessageBatcher:
+    """Queue text messages and send them joined, per chat, from one flush loop."""
+
+    def __init__(
+        self,
+        bot: "Bot",
+        window_seconds: float = 0.5,
+        flush_chars: int = 3800,
+        separator: str = "\n\n"
+    ):
+        """
+        Args:
+            bot: Telegram bot used for the joined sends
+            window_seconds: Max time to wait for more messages after the first
+            flush_chars: Flush early once this many chars are queued
+            separator: Inserted between joined message bodies
+        """
+        self.bot = bot
+        self.window_seconds = window_seconds
+        self.flush_chars = flush_chars
+        self.separator = separator
+        self._queue: asyncio.Queue[_QueuedMessage] = asyncio.Queue()
+
+    async def send(self, chat_id: int, text: str, parse_mode: Optional[str] = None) -> None:
+        """
+        Queue a message and wait until the send containing it completes.
+
+        Raises:
+            Whatever send_message raised for this message (fail-fast callers
+            keep their error handling and retry semantics)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((chat_id, parse_mode, text, future))
+        await future
+
+    async def run(self) -> None:
+        """Flush loop: collect one window of messages, send, repeat (until cancelled)."""
+        loop = asyncio.get_running_loop()
+        batch: List[_QueuedMessage] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                queued_chars = len(batch[0][2])
+                deadline = loop.time() + self.window_seconds
+
+                while queued_chars < self.flush_chars:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except TimeoutError:
+                        break
+                    batch.append(item)
+                    queued_chars += len(item[2])
+
+                await self._flush(batch)
+        finally:
+            # Don't leave senders waiting on a loop that is gone
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for *_, future in batch:
+                future.cancel()
+
+    async def _flush(self, batch: List[_QueuedMessage]) -> None:
+        """Send a window's messages, joined per (chat, parse_mode) within the size cap."""
+        groups: Dict[Tuple[int, Optional[str]], List[_QueuedMessage]] = {}
+        for item in batch:
+            groups.setdefault((item[0], item[1]), []).append(item)
+
+        for (chat_id, parse_mode), items in groups.items():
+            for chunk in self._chunk(items):
+                text = self.separator.join(item[2] for item in chunk)
+                try:
+                    await self.bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+                except BadRequest as e:
+                    if len(chunk) == 1:
+                        _resolve(chunk[0][3], e)
+                        continue
+                    # One bad message (e.g. broken markup) rejects the joined send:
+                    # retry each on its own so only the offending caller sees it
+                    for item in chunk:
+                        try:
+                            await self.bot.send_message(
+                                chat_id=chat_id, text=item[2], parse_mode=parse_mode
+                            )
+                        except Exception as item_error:
+                            _resolve(item[3], item_error)
+                        else:
+                            _resolve(item[3])
+                except Exception as e:
+                    # Timeouts may have delivered the message and RetryAfter means
+                    # a flood wait: resending would duplicate or hammer, so every
+                    # caller gets the error once and handles it as before
+                    for *_, future in chunk:
+                        _resolve(future, e)
+                else:
+                    for *_, future in chunk:
+                        _resolve(future)
+
+    def _chunk(self, items: List[_QueuedMessage]) -> List[List[_QueuedMessage]]:
+        """Split items into runs whose joined text fits one Telegram message."""
+        chunks: List[List[_QueuedMessage]] = []
+        current: List[_QueuedMessage] = []
+        current_len = 0
+        for item in items:
+            added = len(item[2]) + (len(self.separator) if current else 0)
+            if current and current_len + added > TELEGRAM_MAX_CHARS:
+                chunks.append(current)
+                current, current_len = [], 0
+                added = len(item[2])
+            current.append(item)
+            current_len += added
+        if current:
+            chunks.append(current)
+        return chunks
+
+
+def _resolve(future: asyncio.Future, error: Optional[BaseException] = None) -> None:
+    """Complete a sender's future unless it was already cancelled."""
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
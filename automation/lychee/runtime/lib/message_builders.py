@@ -4,17 +4,125 @@ Telegram message builders for bot workflows.
 Pure message formatting functions for consistent Telegram display.
 """
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+import ijson
+import orjson
 
 # Import formatting utilities
 from format_utils import (
     format_git_status_compact,
+    format_git_porcelain_display,
     format_repo_display,
     escape_markdown,
+    escape_markdown_single_line,
+    first_nonempty_line,
     convert_to_telegram_markdown
 )
 
+# Leading slice of stdout/stderr inspected before stripping (display caps at 500)
+OUTPUT_HEAD_CHARS = 600
+
+# JSON stdout at least this large is stream-parsed for "result" instead of fully loaded
+STREAM_PARSE_MIN_CHARS = 64 * 1024
+
+# status -> (status emoji, title suffix, status line template)
+_STATUS_TABLE: Dict[str, Tuple[str, str, str]] = {
+    "success": ("✅", "Completed", "**Duration**: {duration}s"),
+    "error": ("❌", "Failed", "**Duration**: {duration}s | **Exit Code**: {exit_code}"),
+    "timeout": ("⏱️", "Timeout", "**Duration**: {duration}s (limit reached)"),
+}
+
+# Debug log hint (identical for every message; ${session} is for the reader's shell)
+DEBUG_LOG_LINE = "`debug=~/.claude/debug/${session}.txt`"
+# Same line brace-escaped, for str.format templates
+DEBUG_LOG_LINE_FORMAT = DEBUG_LOG_LINE.replace("{", "{{").replace("}", "}}")
+
+# Session context header for workflow start messages (rendered with format_map)
+_SESSION_HEADER_TEMPLATE = (
+    "{prompt_line}{emoji} **{last_response}**\n\n"
+    "`{repo_display}` | `{working_dir}`\n"
+    "`session={session_id}`\n"
+    f"{DEBUG_LOG_LINE_FORMAT} ({{duration}}s)\n"
+    "**↯**: `{git_branch}` | {git_compact}{git_porcelain_display}\n\n"
+    "**Lychee**: {lychee_details}\n\n"
+)
+
+# Progress trailer shown until the orchestrator reports its first stage
+_WORKFLOW_STARTING_TRAILER = (
+    "⏳ **Workflow: {workflow_name}**\n"
+    "**Stage**: starting | **Progress**: 0%\n"
+    "**Status**: Starting..."
+)
+
+# Full start message template (joined once at import, rendered in one pass)
+_WORKFLOW_START_TEMPLATE = _SESSION_HEADER_TEMPLATE + _WORKFLOW_STARTING_TRAILER
+
+
+def format_session_lines(session_id: str, headless_session_id: Optional[str] = None) -> str:
+    """
+    Format session (+ headless session) and debug log lines.
+
+    Each value is its own inline code span - single backticks can't contain
+    newlines in MarkdownV2.
+
+    Args:
+        session_id: Original session identifier
+        headless_session_id: Separate session ID of headless (-p) execution, if any
+
+    Returns:
+        Two or three newline-separated lines
+    """
+    if headless_session_id:
+        return f"`session={session_id}`\n`headless={headless_session_id}`\n{DEBUG_LOG_LINE}"
+    return f"`session={session_id}`\n{DEBUG_LOG_LINE}"
+
+
+def _extract_result(stdout: str) -> Any:
+    """
+    Extract the top-level "result" field from JSON stdout.
+
+    Large outputs are scanned with ijson, which stops as soon as "result"
+    has been read instead of building the whole document.
+
+    Args:
+        stdout: Captured process output (expected to start with "{")
+
+    Returns:
+        The "result" value, or None if missing or stdout is not JSON
+    """
+    if len(stdout) < STREAM_PARSE_MIN_CHARS:
+        try:
+            result_data = orjson.loads(stdout)
+        except orjson.JSONDecodeError:
+            return None
+        return result_data.get("result") if isinstance(result_data, dict) else None
+
+    try:
+        return next(ijson.items(stdout.encode(), "result"), None)
+    except ijson.JSONError:
+        return None
+
+
+def _format_status(status: str, kind: str, duration: Any, exit_code: Any) -> Tuple[str, str, str]:
+    """
+    Look up status emoji, title, and status line for a completion/execution.
+
+    Args:
+        status: Status value (success, error, timeout, ...)
+        kind: Title prefix (e.g., "Workflow", "Auto-Fix")
+        duration: Duration in seconds
+        exit_code: Process exit code
+
+    Returns:
+        Tuple of (status_emoji, title, status_line)
+    """
+    entry = _STATUS_TABLE.get(status)
+    if entry is None:
+        return "⚠️", "Unknown Status", f"**Status**: {status}"
+    status_emoji, suffix, line_template = entry
+    return status_emoji, f"{kind} {suffix}", line_template.format(duration=duration, exit_code=exit_code)
+
 
 def build_workflow_start_message(
     emoji: str,
@@ -41,10 +149,6 @@ def build_workflow_start_message(
     lychee_status = summary_data.get("lychee_status", {})
 
     git_branch = git_status.get("branch", "unknown")
-    git_modified = git_status.get("modified_files", 0)
-    git_untracked = git_status.get("untracked_files", 0)
-    git_staged = git_status.get("staged_files", 0)
-    git_porcelain_lines = git_status.get('porcelain', [])
 
     # Extract repository root and working directory
     repository_root = summary_data.get("repository_root", summary_data.get("workspace_path", workspace_path))
@@ -62,51 +166,48 @@ def build_workflow_start_message(
 
     duration = summary_data.get("duration_seconds", 0)
 
-    # Build git porcelain display (truncate to avoid huge messages)
-    git_porcelain_display = ""
-    if git_porcelain_lines:
-        display_lines = git_porcelain_lines[:10]
-        porcelain_text = "\n".join(display_lines)
-        if len(git_porcelain_lines) > 10:
-            porcelain_text += f"\n... and {len(git_porcelain_lines) - 10} more"
-        # Wrap in code block for proper formatting (prevents markdown parsing issues)
-        git_porcelain_display = f"\n```\n{porcelain_text}\n```"
-
-    # Compact git status
-    git_compact = format_git_status_compact(git_modified, git_staged, git_untracked)
-
-    # Escape markdown in user_prompt and last_response
-    if user_prompt:
-        user_prompt = escape_markdown(user_prompt)
+    # Git displays are pre-rendered by the summary handler; rebuild only if absent
+    git_porcelain_display = summary_data.get("git_porcelain_display")
+    if git_porcelain_display is None:
+        # Build git porcelain display (truncate to avoid huge messages)
+        git_porcelain_display = format_git_porcelain_display(git_status.get('porcelain', []))
+
+    git_compact = summary_data.get("git_compact")
+    if git_compact is None:
+        git_compact = format_git_status_compact(
+            git_status.get("modified_files", 0),
+            git_status.get("staged_files", 0),
+            git_status.get("untracked_files", 0)
+        )
+
+    # Escape markdown in last_response
     if last_response:
         last_response = escape_markdown(last_response)
 
     # Build message with full context
     # Use plain text without markdown formatting to avoid MarkdownV2 parsing issues
-    # Replace newlines with spaces for single-line display
-    prompt_line = f"❓ {user_prompt.replace('\n', ' ').strip()}\n" if user_prompt else ""
+    # Escape and replace newlines with spaces in one pass for single-line display
+    prompt_line = f"❓ {escape_markdown_single_line(user_prompt).strip()}\n" if user_prompt else ""
 
     # Escape lychee details
     lychee_details = lychee_status.get('details', 'Not run')
     if lychee_details:
         lychee_details = escape_markdown(lychee_details)
 
-    # Session + debug log lines (two lines, no emoji)
-    # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-    session_line = f"`session={session_id}`"
-    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-
-    markdown_message = (
-        f"{prompt_line}{emoji} **{last_response}**\n\n"
-        f"`{repo_display}` | `{working_dir}`\n"
-        f"{session_line}\n"
-        f"{debug_line} ({duration}s)\n"
-        f"**↯**: `{git_branch}` | {git_compact}{git_porcelain_display}\n\n"
-        f"**Lychee**: {lychee_details}\n\n"
-        f"⏳ **Workflow: {workflow_name}**\n"
-        f"**Stage**: starting | **Progress**: 0%\n"
-        f"**Status**: Starting..."
-    )
+    markdown_message = _WORKFLOW_START_TEMPLATE.format_map({
+        "prompt_line": prompt_line,
+        "emoji": emoji,
+        "last_response": last_response,
+        "repo_display": repo_display,
+        "working_dir": working_dir,
+        "session_id": session_id,
+        "duration": duration,
+        "git_branch": git_branch,
+        "git_compact": git_compact,
+        "git_porcelain_display": git_porcelain_display,
+        "lychee_details": lychee_details,
+        "workflow_name": workflow_name
+    })
     return convert_to_telegram_markdown(markdown_message)
 
 
@@ -129,69 +230,52 @@ def build_completion_message(completion: Dict[str, Any], emoji: str) -> str:
     exit_code = completion["exit_code"]
 
     # Choose emoji and title based on status
-    if status == "success":
-        status_emoji = "✅"
-        title = "Auto-Fix Completed"
-        status_line = f"**Duration**: {duration}s"
-    elif status == "error":
-        status_emoji = "❌"
-        title = "Auto-Fix Failed"
-        status_line = f"**Duration**: {duration}s | **Exit Code**: {exit_code}"
-    elif status == "timeout":
-        status_emoji = "⏱️"
-        title = "Auto-Fix Timeout"
-        status_line = f"**Duration**: {duration}s (limit reached)"
-    else:
-        status_emoji = "⚠️"
-        title = "Unknown Status"
-        status_line = f"**Status**: {status}"
-
-    # Session + debug log lines (two lines, no emoji)
-    # Use separate inline code blocks - single backticks can't contain newlines in MarkdownV2
-    session_line = f"`session={session_id}`"
-    debug_line = f"`debug=~/.claude/debug/${{session}}.txt`"
-
-    markdown_message = f"""{emoji} {status_emoji} **{title}**
-
-**Workspace**: `{workspace_id}`
-{session_line}
-{debug_line}
-{status_line}
-
-**Summary**:
-{summary}
-"""
+    status_emoji, title, status_line = _format_status(status, "Auto-Fix", duration, exit_code)
+
+    # Collect lines and join once (stdout/stderr sections can be long)
+    parts: List[str] = [
+        f"{emoji} {status_emoji} **{title}**",
+        "",
+        f"**Workspace**: `{workspace_id}`",
+        format_session_lines(session_id),
+        status_line,
+        "",
+        "**Summary**:",
+        summary,
+        "",
+    ]
 
     # Add stdout for success cases (truncated to avoid huge messages)
     if status == "success" and completion.get("stdout"):
-        stdout = completion["stdout"].strip()
-        if stdout:
+        stdout = completion["stdout"]
+        # Slice before strip so large captures are never copied in full
+        stdout_head = stdout[:OUTPUT_HEAD_CHARS].strip()
+        if stdout_head:
             # Extract readable content from JSON (if applicable)
-            readable_content = stdout
-            try:
-                result_data = json.loads(stdout)
-                if isinstance(result_data, dict) and 'result' in result_data:
-                    readable_content = result_data['result']
-            except json.JSONDecodeError:
-                pass  # Use raw output if not JSON
+            readable_content = stdout_head
+            if stdout_head.startswith("{"):
+                result = _extract_result(stdout)
+                if result is not None:
+                    # "result" may be any JSON value (dict, list, number)
+                    readable_content = result if isinstance(result, str) else str(result)
 
             # Truncate to 500 chars
             if len(readable_content) > 500:
                 readable_content = readable_content[:500] + "..."
 
-            markdown_message += f"\n**Details**:\n```\n{readable_content}\n```"
+            parts.extend(("**Details**:", "```", readable_content, "```"))
 
     # Add stderr for error cases (truncated to avoid huge messages)
     if status == "error" and completion.get("stderr"):
-        stderr = completion["stderr"].strip()
+        stderr = completion["stderr"][:OUTPUT_HEAD_CHARS].strip()
         if stderr:
             # Truncate to 500 chars
             if len(stderr) > 500:
                 stderr = stderr[:500] + "..."
 
-            markdown_message += f"\n**Error**:\n```\n{stderr}\n```"
+            parts.extend(("**Error**:", "```", stderr, "```"))
 
-    return convert_to_telegram_markdown(markdown_message)
+    return convert_to_telegram_markdown("\n".join(parts))
 
 
 def build_execution_message(execution: Dict[str, Any], emoji: str, workflow_name: str) -> str:
@@ -218,70 +302,53 @@ def build_execution_message(execution: Dict[str, Any], emoji: str, workflow_name
     full_workflow_name = f"{workflow_icon} {workflow_name}"
 
     # Choose emoji and title based on status
-    if status == "success":
-        status_emoji = "✅"
-        title = "Workflow Completed"
-        status_line = f"**Duration**: {duration}s"
-    elif status == "error":
-        status_emoji = "❌"
-        title = "Workflow Failed"
-        status_line = f"**Duration**: {duration}s | **Exit Code**: {exit_code}"
-    elif status == "timeout":
-        status_emoji = "⏱️"
-        title = "Workflow Timeout"
-        status_line = f"**Duration**: {duration}s (limit reached)"
-    else:
-        status_emoji = "⚠️"
-        title = "Unknown Status"
-        status_line = f"**Status**: {status}"
+    status_emoji, title, status_line = _format_status(status, "Workflow", duration, exit_code)
 
     # Debug log path
     debug_log = f"~/.claude/debug/{session_id}.txt"
 
-    markdown_message = f"""{emoji} {status_emoji} **{title}**
-
-**Workflow**: {full_workflow_name}
-**Workspace**: `{workspace_id}`
-**Session**: `{session_id}`
-**Debug Log**: `{debug_log}`
-{status_line}
-"""
+    parts: List[str] = [
+        f"{emoji} {status_emoji} **{title}**",
+        "",
+        f"**Workflow**: {full_workflow_name}",
+        f"**Workspace**: `{workspace_id}`",
+        f"**Session**: `{session_id}`",
+        f"**Debug Log**: `{debug_log}`",
+        status_line,
+        "",
+    ]
 
     # Add stdout for success cases (truncated)
     if status == "success" and execution.get("stdout"):
-        stdout = execution["stdout"].strip()
-        if stdout:
+        stdout = execution["stdout"]
+        stdout_head = stdout[:OUTPUT_HEAD_CHARS].strip()
+        if stdout_head:
             # Extract readable content from JSON (if applicable)
             readable_content = stdout
-            try:
-                result_data = json.loads(stdout)
-                if isinstance(result_data, dict) and 'result' in result_data:
-                    readable_content = result_data['result']
-            except json.JSONDecodeError:
-                pass  # Use raw output if not JSON
+            if stdout_head.startswith("{"):
+                result = _extract_result(stdout)
+                if result is not None:
+                    # "result" may be any JSON value (dict, list, number)
+                    readable_content = result if isinstance(result, str) else str(result)
 
             # Get first meaningful line as summary
-            lines = [l.strip() for l in readable_content.split('\n') if l.strip()]
-            summary = lines[0] if lines else "Completed"
+            summary = first_nonempty_line(readable_content) or "Completed"
 
             # Truncate if too long
             if len(summary) > 200:
                 summary = summary[:200] + "..."
 
-            markdown_message += f"\n**Summary**: {summary}"
+            parts.append(f"**Summary**: {summary}")
 
     # Add stderr for error cases (truncated)
     if status == "error" and execution.get("stderr"):
-        stderr = execution["stderr"].strip()
-        if stderr:
-            # Get first line only
-            error_lines = stderr.split('\n')
-            error_preview = error_lines[0] if error_lines else stderr
-
+        # Get first line only
+        error_preview = first_nonempty_line(execution["stderr"])
+        if error_preview:
             # Truncate if too long
             if len(error_preview) > 200:
                 error_preview = error_preview[:200] + "..."
 
-            markdown_message += f"\n**Error**: {error_preview}"
+            parts.append(f"**Error**: {error_preview}")
 
-    return convert_to_telegram_markdown(markdown_message)
+    return convert_to_telegram_markdown("\n".join(parts))
@@ -0,0 +1,248 @@
+"""
+SQLite-backed persistence for bot progress tracking and summary cache.
+
+Replaces the per-workflow *_tracking.json files: one WAL-mode database,
+one UPSERT/DELETE per change instead of open/write/rename/unlink per file.
+Survives watchexec restarts like the files did.
+
+Callback paths hand writes to a background writer (queue_write) so they
+never wait on disk; the writer commits each burst in one transaction.
+
+Fail-fast: sqlite3 errors propagate to the caller. The background writer
+logs and drops a failed batch instead, so one bad write can't stop it.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger("lychee.bot")
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS tracking (
+        workspace_id TEXT NOT NULL,
+        session_id TEXT NOT NULL,
+        workflow_id TEXT NOT NULL,
+        data BLOB NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (workspace_id, session_id, workflow_id)
+    );
+    CREATE TABLE IF NOT EXISTS summaries (
+        workspace_id TEXT NOT NULL,
+        session_id TEXT NOT NULL,
+        data BLOB NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (workspace_id, session_id)
+    );
+"""
+
+UPSERT_TRACKING_SQL = """
+    INSERT INTO tracking (workspace_id, session_id, workflow_id, data, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (workspace_id, session_id, workflow_id)
+    DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+"""
+
+UPSERT_SUMMARY_SQL = """
+    INSERT INTO summaries (workspace_id, session_id, data, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (workspace_id, session_id)
+    DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+"""
+
+# Set by open_state_store(); writes may come from asyncio.to_thread workers
+_conn: Optional[sqlite3.Connection] = None
+# Reentrant: a writer batch holds it across its transaction while each write re-acquires it
+_lock = threading.RLock()
+
+# (write function, args); set from start_state_writer() until the writer task exits
+_StateWrite = Tuple[Callable[..., Any], Tuple[Any, ...]]
+_write_queue: Optional[asyncio.Queue] = None
+
+
+def open_state_store(db_path: Path) -> None:
+    """
+    Open (creating if needed) the state database.
+
+    Autocommit mode: every statement is its own short transaction, so WAL
+    readers never wait on a long-held write lock.
+
+    Args:
+        db_path: SQLite database file
+    """
+    global _conn
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA_SQL)
+    _conn = conn
+
+
+def close_state_store() -> None:
+    """Close the state database (no-op if not open)."""
+    global _conn
+    if _conn is not None:
+        with _lock:
+            _conn.close()
+        _conn = None
+
+
+def _require_conn() -> sqlite3.Connection:
+    if _conn is None:
+        raise RuntimeError("State store not opened (call open_state_store first)")
+    return _conn
+
+
+def _execute(sql: str, params: Tuple = ()) -> int:
+    """Run one write statement; returns affected row count."""
+    conn = _require_conn()
+    with _lock:
+        return conn.execute(sql, params).rowcount
+
+
+def _query(sql: str) -> List[tuple]:
+    conn = _require_conn()
+    with _lock:
+        return conn.execute(sql).fetchall()
+
+
+def save_tracking(progress_key: tuple, tracking_data: Dict[str, Any]) -> None:
+    """Insert or replace tracking data for (workspace_id, session_id, workflow_id)."""
+    _execute(UPSERT_TRACKING_SQL, (*progress_key, orjson.dumps(tracking_data), time.time()))
+
+
+def delete_tracking(progress_key: tuple) -> None:
+    """Remove tracking data for (workspace_id, session_id, workflow_id)."""
+    _execute(
+        "DELETE FROM tracking WHERE workspace_id = ? AND session_id = ? AND workflow_id = ?",
+        progress_key
+    )
+
+
+def load_tracking() -> List[Tuple[tuple, Dict[str, Any]]]:
+    """Return (progress_key, tracking_data) pairs, oldest first."""
+    rows = _query(
+        "SELECT workspace_id, session_id, workflow_id, data FROM tracking ORDER BY updated_at"
+    )
+    return [((ws, sess, wf), orjson.loads(data)) for ws, sess, wf, data in rows]
+
+
+def save_summary(cache_key: tuple, summary_data: Dict[str, Any]) -> None:
+    """Insert or replace cached summary data for (workspace_id, session_id)."""
+    _execute(UPSERT_SUMMARY_SQL, (*cache_key, orjson.dumps(summary_data), time.time()))
+
+
+def load_summaries() -> List[Tuple[tuple, Dict[str, Any]]]:
+    """Return (cache_key, summary_data) pairs, oldest first."""
+    rows = _query(
+        "SELECT workspace_id, session_id, data FROM summaries ORDER BY updated_at"
+    )
+    return [((ws, sess), orjson.loads(data)) for ws, sess, data in rows]
+
+
+def prune_state(ttl_minutes: int) -> int:
+    """
+    Delete tracking and summary rows not updated within the TTL.
+
+    Args:
+        ttl_minutes: Age threshold in minutes
+
+    Returns:
+        Number of rows removed
+    """
+    cutoff = time.time() - ttl_minutes * 60
+    removed = _execute("DELETE FROM tracking WHERE updated_at < ?", (cutoff,))
+    removed += _execute("DELETE FROM summaries WHERE updated_at < ?", (cutoff,))
+    return removed
+
+
+def queue_write(write: Callable[..., Any], *args: Any) -> None:
+    """
+    Queue a state write (e.g. save_tracking) for the background writer.
+
+    Writes run in queue order. Falls back to running inline when the writer
+    isn't running (before startup or after shutdown).
+    Callers must not mutate args afterwards (pass a copy if they will).
+
+    Args:
+        write: Module write function (save_tracking, delete_tracking, save_summary)
+        *args: Arguments for write
+    """
+    if _write_queue is None:
+        write(*args)
+        return
+    _write_queue.put_nowait((write, args))
+
+
+def _write_batch(batch: List[_StateWrite]) -> None:
+    """Apply queued writes in one transaction (rolled back if any write fails)."""
+    conn = _require_conn()
+    with _lock:
+        conn.execute("BEGIN")
+        try:
+            for write, args in batch:
+                write(*args)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _commit_batch(batch: List[_StateWrite]) -> None:
+    """Write one batch for the background writer, logging (not raising) failures."""
+    try:
+        _write_batch(batch)
+    except sqlite3.Error as e:
+        logger.error("❌ Dropped %d state write(s): %s", len(batch), e)
+
+
+def start_state_writer() -> asyncio.Task:
+    """
+    Start the background state writer.
+
+    The queue is installed before returning, so queue_write() calls made
+    right after this (before the task first runs) are queued too.
+
+    Returns:
+        Writer task (cancel and await it to flush pending writes)
+    """
+    global _write_queue
+    _write_queue = asyncio.Queue()
+    return asyncio.create_task(run_state_writer(_write_queue))
+
+
+async def run_state_writer(queue: asyncio.Queue) -> None:
+    """
+    Drain queued writes into the state database off the event loop.
+
+    Everything queued by the time a batch starts is committed together.
+    A batch that fails is rolled back, logged and dropped; the writer keeps
+    running. Pending writes are flushed when the task is cancelled.
+
+    Args:
+        queue: Write queue installed by start_state_writer()
+    """
+    global _write_queue
+    batch: List[_StateWrite] = []
+    try:
+        while True:
+            batch.append(await queue.get())
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            # Hand the batch off before awaiting: if cancelled mid-write, the
+            # thread finishes it and the flush below must not write it again
+            to_write, batch = batch, []
+            await asyncio.to_thread(_commit_batch, to_write)
+    finally:
+        _write_queue = None
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            _commit_batch(batch)
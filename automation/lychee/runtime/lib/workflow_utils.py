@@ -6,7 +6,10 @@ Business logic for loading and filtering workflows based on trigger conditions.
 
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+# mtime of the workflows.json most recently loaded (hot-reload when it changes)
+_loaded_mtime_ns: Optional[int] = None
 
 
 def load_workflow_registry(registry_path: Path) -> Dict[str, Any]:
@@ -24,8 +27,12 @@ def load_workflow_registry(registry_path: Path) -> Dict[str, Any]:
         json.JSONDecodeError: Invalid JSON
         ValueError: Invalid registry schema
     """
-    if not registry_path.exists():
-        raise FileNotFoundError(f"Workflow registry not found: {registry_path}")
+    global _loaded_mtime_ns
+
+    try:
+        mtime_ns = registry_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Workflow registry not found: {registry_path}") from None
 
     with open(registry_path) as f:
         registry = json.load(f)
@@ -35,9 +42,36 @@ def load_workflow_registry(registry_path: Path) -> Dict[str, Any]:
         raise ValueError("Invalid registry: missing 'version' or 'workflows'")
 
     print(f"✅ Loaded workflow registry v{registry['version']} ({len(registry['workflows'])} workflows)")
+    _loaded_mtime_ns = mtime_ns
     return registry
 
 
+def refresh_workflow_registry(
+    registry_path: Path,
+    current: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Reload workflow registry only if workflows.json changed since last load.
+
+    Costs one stat() when unchanged. A missing or invalid file during an
+    edit keeps the current registry instead of dropping all workflows.
+
+    Args:
+        registry_path: Path to workflows.json file
+        current: Registry currently in use
+
+    Returns:
+        Reloaded registry, or current if unchanged or unreadable
+    """
+    try:
+        if registry_path.stat().st_mtime_ns == _loaded_mtime_ns:
+            return current
+        return load_workflow_registry(registry_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Keeping previous workflow registry: {type(e).__name__}: {e}")
+        return current
+
+
 def filter_workflows_by_triggers(
     workflow_registry: Dict[str, Any],
     summary: Dict[str, Any]
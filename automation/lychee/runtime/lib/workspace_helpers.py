@@ -5,23 +5,46 @@ Shared utilities for workspace routing and callback mapping.
 
 import hashlib
 import json
+import os
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 
 # State directories
 STATE_DIR = Path.home() / ".claude" / "automation" / "lychee" / "state"
 CALLBACK_DIR = STATE_DIR / "callbacks"
 REGISTRY_FILE = STATE_DIR / "registry.json"
 
+# Canonical home directory, resolved once (every workspace must live under it;
+# the orchestrator worker validates a workspace per request)
+HOME_DIR_RESOLVED = Path.home().resolve()
+
 # TTL for state files
 STATE_TTL_MINUTES = 30
 
+# State/callback JSON is machine-to-machine: compact unless LYCHEE_PRETTY_STATE_JSON=1 (debugging)
+PRETTY_STATE_JSON = os.getenv("LYCHEE_PRETTY_STATE_JSON") == "1"
+
+# Parsed registry keyed by file mtime (read on every callback, rarely changes);
+# path_index maps resolved workspace paths to IDs, built lazily per registry load
+_registry_cache: Dict[str, Any] = {"mtime_ns": None, "data": None, "path_index": None}
+
 
 def load_registry() -> Dict[str, Any]:
-    """Load workspace registry."""
-    if not REGISTRY_FILE.exists():
-        raise FileNotFoundError(f"Registry not found: {REGISTRY_FILE}")
+    """
+    Load workspace registry.
+
+    Re-reads registry.json only when its mtime changes; callers must treat
+    the returned dict as read-only.
+    """
+    try:
+        mtime_ns = REGISTRY_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Registry not found: {REGISTRY_FILE}") from None
+
+    if _registry_cache["mtime_ns"] == mtime_ns:
+        return _registry_cache["data"]
 
     with REGISTRY_FILE.open() as f:
         registry = json.load(f)
@@ -30,6 +53,9 @@ def load_registry() -> Dict[str, Any]:
     if "version" not in registry or "workspaces" not in registry:
         raise ValueError("Invalid registry schema")
 
+    _registry_cache["mtime_ns"] = mtime_ns
+    _registry_cache["data"] = registry
+    _registry_cache["path_index"] = None
     return registry
 
 
@@ -49,11 +75,18 @@ def get_workspace_id_from_path(workspace_path: Path) -> str:
     workspace_path = workspace_path.resolve()
     registry = load_registry()
 
-    for ws_id, ws_config in registry["workspaces"].items():
-        if Path(ws_config["path"]).resolve() == workspace_path:
-            return ws_id
+    # Resolve registered paths once per registry load, not once per lookup
+    path_index = _registry_cache["path_index"]
+    if path_index is None:
+        path_index = {}
+        for ws_id, ws_config in registry["workspaces"].items():
+            path_index.setdefault(Path(ws_config["path"]).resolve(), ws_id)  # First match wins
+        _registry_cache["path_index"] = path_index
 
-    raise ValueError(f"Workspace not registered: {workspace_path}")
+    try:
+        return path_index[workspace_path]
+    except KeyError:
+        raise ValueError(f"Workspace not registered: {workspace_path}") from None
 
 
 def compute_workspace_hash(workspace_path: Path) -> str:
@@ -66,8 +99,14 @@ def compute_workspace_hash(workspace_path: Path) -> str:
     Returns:
         8-character hex hash
     """
-    workspace_path = workspace_path.resolve()
-    return hashlib.sha256(str(workspace_path).encode()).hexdigest()[:8]
+    return _workspace_hash_cached(str(workspace_path))
+
+
+@lru_cache(maxsize=128)
+def _workspace_hash_cached(workspace_path: str) -> str:
+    """Memoized resolve + SHA256 (same workspace sends many files per session)."""
+    resolved = Path(workspace_path).resolve()
+    return hashlib.sha256(str(resolved).encode()).hexdigest()[:8]
 
 
 def create_callback_data(
@@ -92,28 +131,67 @@ def create_callback_data(
     Returns:
         Callback identifier (format: "cb_{hash8}")
     """
-    context = {
+    return create_callback_data_batch(workspace_id, workspace_path, session_id, (action,), correlation_id)[action]
+
+
+def create_callback_data_batch(
+    workspace_id: str,
+    workspace_path: str,
+    session_id: str,
+    actions: Iterable[str],
+    correlation_id: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Create callback_data for several actions sharing one context.
+
+    Path resolution, timestamp, directory creation and serialization of the
+    shared fields happen once for the whole keyboard; each button only
+    encodes its action name.
+
+    Args:
+        workspace_id: Workspace identifier
+        workspace_path: Absolute workspace path
+        session_id: Session UUID
+        actions: Action names, one per button
+        correlation_id: Optional ULID for request tracing
+
+    Returns:
+        Mapping of action -> callback identifier (format: "cb_{hash8}")
+    """
+    resolved_path = str(Path(workspace_path).resolve())
+    timestamp = datetime.now(timezone.utc).isoformat()
+    CALLBACK_DIR.mkdir(parents=True, exist_ok=True)
+
+    shared = {
         "workspace_id": workspace_id,
-        "workspace_path": str(Path(workspace_path).resolve()),
+        "workspace_path": resolved_path,
         "session_id": session_id,
-        "action": action,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": timestamp
     }
 
     if correlation_id:
-        context["correlation_id"] = correlation_id
+        shared["correlation_id"] = correlation_id
 
-    # Generate hash
-    context_json = json.dumps(context, sort_keys=True)
-    hash_val = hashlib.sha256(context_json.encode()).hexdigest()[:8]
-    callback_id = f"cb_{hash_val}"
+    # "action" sorts before every shared key, so splicing it in front of the
+    # shared fields' sorted JSON gives exactly json.dumps(context, sort_keys=True)
+    shared_json_tail = json.dumps(shared, sort_keys=True)[1:]
 
-    # Store mapping
-    CALLBACK_DIR.mkdir(parents=True, exist_ok=True)
-    callback_file = CALLBACK_DIR / f"{callback_id}.json"
-    callback_file.write_text(json.dumps(context, indent=2))
+    callback_ids: Dict[str, str] = {}
+    for action in actions:
+        # Generate hash
+        context_json = f'{{"action": {json.dumps(action)}, {shared_json_tail}'
+        hash_val = hashlib.sha256(context_json.encode()).hexdigest()[:8]
+        callback_id = f"cb_{hash_val}"
 
-    return callback_id
+        # Store mapping
+        callback_file = CALLBACK_DIR / f"{callback_id}.json"
+        if PRETTY_STATE_JSON:
+            callback_file.write_text(json.dumps({"action": action, **shared}, indent=2, sort_keys=True))
+        else:
+            callback_file.write_text(context_json)
+        callback_ids[action] = callback_id
+
+    return callback_ids
 
 
 def resolve_callback_data(callback_id: str) -> Dict[str, Any]:
@@ -159,9 +237,8 @@ def validate_workspace_path(workspace_path: Path) -> Path:
     workspace_path = workspace_path.resolve()
 
     # Must be under user home
-    home = Path.home().resolve()
     try:
-        workspace_path.relative_to(home)
+        workspace_path.relative_to(HOME_DIR_RESOLVED)
     except ValueError:
         raise ValueError(f"Workspace outside home directory: {workspace_path}")
 
@@ -183,6 +260,9 @@ def cleanup_expired_files(
     """
     Remove expired and excess state files.
 
+    One os.scandir pass with one stat per file (mtime reused for both the
+    newest-first ordering and the TTL check).
+
     Args:
         directory: Directory to clean
         ttl_minutes: Time-to-live in minutes
@@ -191,30 +271,26 @@ def cleanup_expired_files(
     Returns:
         Number of files deleted
     """
-    if not directory.exists():
+    try:
+        with os.scandir(directory) as entries:
+            files = sorted(
+                (
+                    (entry.stat().st_mtime, entry.path) for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ),
+                reverse=True  # Newest first
+            )
+    except FileNotFoundError:
         return 0
 
-    files = sorted(
-        directory.glob("*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True  # Newest first
-    )
-
     deleted = 0
     ttl_seconds = ttl_minutes * 60
     now = datetime.now(timezone.utc).timestamp()
 
-    for idx, file_path in enumerate(files):
-        # Delete if expired
-        age = now - file_path.stat().st_mtime
-        if age > ttl_seconds:
-            file_path.unlink()
-            deleted += 1
-            continue
-
-        # Delete if exceeds max
-        if idx >= max_files:
-            file_path.unlink()
+    for idx, (mtime, file_path) in enumerate(files):
+        # Delete if expired, or if exceeds max
+        if now - mtime > ttl_seconds or idx >= max_files:
+            os.unlink(file_path)
             deleted += 1
 
     return deleted
@@ -4,14 +4,18 @@
 # dependencies = [
 #     "jsonschema>=4.0.0",
 #     "jinja2>=3.1.0",
+#     "orjson>=3.10.0",
 # ]
 # ///
 """
-Multi-Workspace Workflow Orchestrator - One-Shot Execution
+Multi-Workspace Workflow Orchestrator - One-Shot and Worker Execution
 
 Processes selection and approval files, renders Jinja2 templates, executes Claude CLI.
 Supports multi-workflow execution with dependency resolution.
-Exits immediately after completion (no watching, no daemon).
+One-shot mode exits immediately after completion (no watching, no daemon).
+Worker mode (--worker) reads one JSON request per stdin line
+({"file": ..., "correlation_id": ...}) and exits once stdin closes and
+in-flight requests finish, so the bot pays interpreter startup once.
 
 Version: 4.0.0
 Specification: ~/.claude/specifications/telegram-workflows-orchestration-v4.yaml
@@ -28,13 +32,13 @@ Changes from v3.0.0:
 import asyncio
 import json
 import os
-import subprocess
 import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 
+import orjson
 from jinja2 import Template, TemplateError
 
 # Force unbuffered output
@@ -63,8 +67,15 @@ from workspace_helpers import (
     validate_workspace_path,
     get_workspace_id_from_path,
     compute_workspace_hash,
+    PRETTY_STATE_JSON,
     STATE_TTL_MINUTES
 )
+import event_logger
+
+
+def dump_state_json(data: Dict[str, Any]) -> bytes:
+    """Serialize a file handed to the bot (compact unless LYCHEE_PRETTY_STATE_JSON=1)."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY_STATE_JSON else 0)
 
 
 # Event Logging
@@ -77,7 +88,10 @@ def log_event(
     metadata: Dict[str, Any] = None
 ) -> None:
     """
-    Log event to SQLite event store via event_logger.py.
+    Log event to SQLite event store (in-process, one short transaction).
+
+    Writing directly instead of spawning event_logger.py keeps worker mode
+    from stalling every in-flight workflow on an interpreter start per event.
 
     Args:
         correlation_id: ULID for request tracing
@@ -88,20 +102,12 @@ def log_event(
         metadata: Event-specific data
 
     Raises:
-        subprocess.CalledProcessError: Event logging failed
+        event_logger.EventLoggingError: Event logging failed
     """
-    event_logger = Path.home() / ".claude" / "automation" / "lychee" / "runtime" / "lib" / "event_logger.py"
-    metadata_json = json.dumps(metadata) if metadata else "{}"
-
     try:
-        subprocess.run(
-            [str(event_logger), correlation_id, workspace_id, session_id, component, event_type, metadata_json],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to log event {event_type}: {e.stderr}", file=sys.stderr)
+        event_logger.log_event(correlation_id, workspace_id, session_id, component, event_type, metadata)
+    except event_logger.EventLoggingError as e:
+        print(f"❌ Failed to log event {event_type}: {e}", file=sys.stderr)
         raise
 
 
@@ -145,8 +151,7 @@ def emit_progress(
 
     # Write atomically (write to temp file, then rename)
     temp_file = progress_file.with_suffix(".tmp")
-    with open(temp_file, "w") as f:
-        json.dump(progress_data, f, indent=2)
+    temp_file.write_bytes(dump_state_json(progress_data))
     temp_file.rename(progress_file)
 
     print(f"   📊 Progress: {stage} ({progress_percent}%) - {message[:50]}")
@@ -237,8 +242,13 @@ def resolve_workflow_dependencies(
 class ApprovalOrchestrator:
     """Processes single approval and executes Claude CLI (one-shot)."""
 
-    def __init__(self):
-        self.correlation_id = None
+    def __init__(self, correlation_id: Optional[str] = None):
+        """
+        Args:
+            correlation_id: Fallback when the approval file carries none
+                (worker requests pass it inline; one-shot uses CORRELATION_ID)
+        """
+        self.correlation_id = correlation_id or os.environ.get("CORRELATION_ID")
         self.workspace_hash = None
         self.session_id = None
 
@@ -257,8 +267,8 @@ class ApprovalOrchestrator:
             state = self._read_approval(approval_file)
             self.session_id = state["session_id"]
 
-            # Extract correlation ID from approval state or environment
-            self.correlation_id = state.get("correlation_id") or os.environ.get("CORRELATION_ID", "unknown")
+            # Extract correlation ID from approval state or request
+            self.correlation_id = state.get("correlation_id") or self.correlation_id or "unknown"
 
             # Validate workspace
             workspace_path = validate_workspace_path(
@@ -314,8 +324,7 @@ class ApprovalOrchestrator:
 
     def _read_approval(self, approval_file: Path) -> Dict[str, Any]:
         """Read and validate approval state file."""
-        with approval_file.open() as f:
-            state = json.load(f)
+        state = orjson.loads(approval_file.read_bytes())
 
         # Validate required fields
         required = ["workspace_path", "session_id", "decision", "timestamp"]
@@ -656,13 +665,14 @@ Instructions:
             "stderr": stderr,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        print(f"      ✓ Completion object created ({len(json.dumps(completion))} bytes)")
+        completion_json = dump_state_json(completion)
+        print(f"      ✓ Completion object created ({len(completion_json)} bytes)")
 
         # Write completion file
         COMPLETION_DIR.mkdir(parents=True, exist_ok=True)
         completion_file = COMPLETION_DIR / f"completion_{session_id}_{workspace_hash}.json"
         print(f"      💾 Writing to: {completion_file.name}")
-        completion_file.write_text(json.dumps(completion, indent=2))
+        completion_file.write_bytes(completion_json)
 
         print(f"📤 Completion notification emitted: {completion_file.name}")
 
@@ -698,8 +708,13 @@ class WorkflowOrchestrator:
     emits execution results.
     """
 
-    def __init__(self):
-        self.correlation_id = None
+    def __init__(self, correlation_id: Optional[str] = None):
+        """
+        Args:
+            correlation_id: Fallback when the selection carries none
+                (worker requests pass it inline; one-shot uses CORRELATION_ID)
+        """
+        self.correlation_id = correlation_id or os.environ.get("CORRELATION_ID")
         self.workspace_hash = None
         self.session_id = None
         self.registry = None
@@ -718,7 +733,7 @@ class WorkflowOrchestrator:
             # Read and validate selection
             selection = self._read_selection(selection_file)
             self.session_id = selection["session_id"]
-            self.correlation_id = selection.get("correlation_id", os.environ.get("CORRELATION_ID", "unknown"))
+            self.correlation_id = selection.get("correlation_id", self.correlation_id or "unknown")
 
             # Load registry if not already loaded
             if workflow_registry is None:
@@ -1142,7 +1157,7 @@ class WorkflowOrchestrator:
             }
         }
 
-        execution_file.write_text(json.dumps(execution_data, indent=2))
+        execution_file.write_bytes(dump_state_json(execution_data))
         print(f"   📄 Execution result written: {execution_file.name}")
 
         # Log execution created
@@ -1157,8 +1172,7 @@ class WorkflowOrchestrator:
 
     def _read_selection(self, selection_file: Path) -> Dict[str, Any]:
         """Read and validate WorkflowSelection file."""
-        with selection_file.open() as f:
-            selection = json.load(f)
+        selection = orjson.loads(selection_file.read_bytes())
 
         # Validate required fields
         required = ["workspace_path", "workspace_id", "session_id", "workflows", "timestamp"]
@@ -1191,8 +1205,7 @@ class WorkflowOrchestrator:
                 f"Workaround: Bot should include summary_data in selection file."
             )
 
-        with open(summary_file) as f:
-            return json.load(f)
+        return orjson.loads(summary_file.read_bytes())
 
     def _build_template_context(
         self,
@@ -1234,41 +1247,17 @@ class WorkflowOrchestrator:
             pass
 
 
-async def main() -> int:
+async def process_request_file(input_file: Path, correlation_id: Optional[str] = None) -> int:
     """
-    One-shot execution: process selection or approval file and exit.
-
-    Dual-mode:
-    - v4: Process WorkflowSelection files (selections/)
-    - v3: Process Approval files (approvals/) - backward compatibility
-    """
-    global workflow_registry
-
-    print("=" * 70)
-    print("Multi-Workspace Workflow Orchestrator - One-Shot Mode")
-    print("=" * 70)
-    print(f"Version: 4.0.0")
-    print(f"Timeout: {CLAUDE_CLI_TIMEOUT}s ({CLAUDE_CLI_TIMEOUT // 60} minutes)")
-    print()
-
-    # Phase 4: Load workflow registry
-    print("📋 Loading workflow registry...")
-    try:
-        workflow_registry = load_workflow_registry()
-    except Exception as e:
-        print(f"❌ Failed to load workflow registry: {type(e).__name__}: {e}", file=sys.stderr)
-        print(f"   Registry path: {WORKFLOWS_REGISTRY}", file=sys.stderr)
-        return 1
+    Route one selection or approval file to its orchestrator.
 
-    # Parse CLI arguments - accept file path
-    if len(sys.argv) < 2:
-        print("Usage: orchestrator.py <selection-file-or-approval-file>", file=sys.stderr)
-        print("  Examples:", file=sys.stderr)
-        print(f"    {sys.argv[0]} state/selections/selection_*.json", file=sys.stderr)
-        print(f"    {sys.argv[0]} state/approvals/approval_*.json", file=sys.stderr)
-        return 1
+    Args:
+        input_file: Resolved selection_*.json or approval_*.json path
+        correlation_id: Tracing ID used when the file itself carries none
 
-    input_file = Path(sys.argv[1]).resolve()
+    Returns:
+        Exit code (0 success, 1 failure)
+    """
     if not input_file.exists():
         print(f"❌ File not found: {input_file}", file=sys.stderr)
         return 1
@@ -1277,7 +1266,7 @@ async def main() -> int:
     if "selection_" in input_file.name:
         # v4: Process WorkflowSelection
         print(f"📝 Processing selection: {input_file.name}")
-        orchestrator = WorkflowOrchestrator()
+        orchestrator = WorkflowOrchestrator(correlation_id)
 
         try:
             await orchestrator.process_selection(input_file)
@@ -1295,7 +1284,7 @@ async def main() -> int:
     elif "approval_" in input_file.name:
         # v3: Process Approval (backward compatibility)
         print(f"📝 Processing approval (v3 backward compat): {input_file.name}")
-        orchestrator = ApprovalOrchestrator()
+        orchestrator = ApprovalOrchestrator(correlation_id)
 
         try:
             await orchestrator.process_approval(input_file)
@@ -1316,5 +1305,93 @@ async def main() -> int:
         return 1
 
 
+async def run_worker() -> int:
+    """
+    Worker mode: process requests read from stdin until EOF.
+
+    Each line is a JSON object {"file": ..., "correlation_id": ...}.
+    Requests run concurrently (as separate one-shot processes did); the
+    registry is reloaded per request so workflows.json edits still apply.
+    Returns once stdin is closed and all in-flight requests have finished.
+    """
+    global workflow_registry
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    in_flight: Set[asyncio.Task] = set()
+    while line := await reader.readline():
+        try:
+            request = orjson.loads(line)
+            input_file = Path(request["file"]).resolve()
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"❌ Invalid worker request {line!r}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+
+        try:
+            workflow_registry = load_workflow_registry()
+        except Exception as e:
+            print(f"❌ Failed to load workflow registry: {type(e).__name__}: {e}", file=sys.stderr)
+            print(f"   Registry path: {WORKFLOWS_REGISTRY}", file=sys.stderr)
+            continue
+
+        task = asyncio.create_task(process_request_file(input_file, request.get("correlation_id")))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    print("📭 Worker input closed, waiting for in-flight requests...")
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return 0
+
+
+async def main() -> int:
+    """
+    Process selection or approval files and exit.
+
+    Dual-mode:
+    - v4: Process WorkflowSelection files (selections/)
+    - v3: Process Approval files (approvals/) - backward compatibility
+
+    Invocation:
+    - orchestrator.py <file>: one-shot, CORRELATION_ID from environment
+    - orchestrator.py --worker: persistent, requests read from stdin
+    """
+    global workflow_registry
+
+    worker_mode = sys.argv[1:2] == ["--worker"]
+
+    print("=" * 70)
+    print(f"Multi-Workspace Workflow Orchestrator - {'Worker' if worker_mode else 'One-Shot'} Mode")
+    print("=" * 70)
+    print(f"Version: 4.0.0")
+    print(f"Timeout: {CLAUDE_CLI_TIMEOUT}s ({CLAUDE_CLI_TIMEOUT // 60} minutes)")
+    print()
+
+    if worker_mode:
+        return await run_worker()
+
+    # Phase 4: Load workflow registry
+    print("📋 Loading workflow registry...")
+    try:
+        workflow_registry = load_workflow_registry()
+    except Exception as e:
+        print(f"❌ Failed to load workflow registry: {type(e).__name__}: {e}", file=sys.stderr)
+        print(f"   Registry path: {WORKFLOWS_REGISTRY}", file=sys.stderr)
+        return 1
+
+    # Parse CLI arguments - accept file path
+    if len(sys.argv) < 2:
+        print("Usage: orchestrator.py <selection-file-or-approval-file> | --worker", file=sys.stderr)
+        print("  Examples:", file=sys.stderr)
+        print(f"    {sys.argv[0]} state/selections/selection_*.json", file=sys.stderr)
+        print(f"    {sys.argv[0]} state/approvals/approval_*.json", file=sys.stderr)
+        print(f"    {sys.argv[0]} --worker  < requests.jsonl", file=sys.stderr)
+        return 1
+
+    return await process_request_file(Path(sys.argv[1]).resolve())
+
+
 if __name__ == "__main__":
     sys.exit(asyncio.run(main()))